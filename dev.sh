@@ -0,0 +1,3 @@
+#!/bin/bash
+cd src
+python3 devserver.py "$@"
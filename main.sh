@@ -1,2 +1,3 @@
-python3 src/main.py
-cd public && python3 -m http.server 8888
\ No newline at end of file
+cd src
+python3 main.py
+python3 staticserver.py --directory ../docs --port 8888
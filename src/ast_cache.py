@@ -0,0 +1,86 @@
+import marshal
+import os
+
+from fsutil import atomic_open
+from htmlnode import node_from_tuple, node_to_tuple
+from manifest import hash_bytes
+from markdown_blocks import RENDERER_VERSION
+
+
+AST_CACHE_SUFFIX = ".marshal"
+
+
+class AstCache:
+    def __init__(self, dir_path, max_bytes=256 * 1024 * 1024):
+        self.dir_path = dir_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, dir_path, max_bytes=256 * 1024 * 1024):
+        os.makedirs(dir_path, exist_ok=True)
+        return cls(dir_path, max_bytes)
+
+    def key(self, markdown):
+        return hash_bytes(f"{RENDERER_VERSION}\0{markdown}".encode("utf-8"))
+
+    def path(self, key):
+        return os.path.join(self.dir_path, key[:2], f"{key}{AST_CACHE_SUFFIX}")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                node = node_from_tuple(marshal.loads(f.read()))
+            os.utime(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return node
+
+    def put(self, key, node):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_open(path, "wb") as f:
+            f.write(marshal.dumps(node_to_tuple(node)))
+
+    def entries(self):
+        entries = []
+        with os.scandir(self.dir_path) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        if entry.name.endswith(AST_CACHE_SUFFIX):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        excess = sum(size for _, size, _ in entries) - self.max_bytes
+        if excess <= 0:
+            return 0
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if excess <= 0:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            excess -= size
+            evicted += 1
+        return evicted
+
+    def to_dict(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __repr__(self):
+        return f"{self.hits} hits, {self.misses} misses"
@@ -0,0 +1,146 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import main as build
+from corpus import add_corpus_arguments, generate_corpus, spec_from_args
+from gencontent import BuildContext, generate_page
+from markdown_blocks import markdown_to_html_node
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def measure(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "max": max(times),
+        "runs": repeat,
+    }
+
+
+def quiet(function):
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+
+    return run
+
+
+def run_suite(spec, repeat=5, jobs=1):
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        static = os.path.join(tmp, "static")
+        output = os.path.join(tmp, "docs")
+        template = os.path.join(ROOT, "template.html")
+        os.makedirs(static)
+        shutil.copy(os.path.join(ROOT, "index.css"), static)
+        shutil.copytree(os.path.join(ROOT, "images"), os.path.join(static, "images"))
+        paths = generate_corpus(content, spec)
+
+        markdowns = []
+        for path in paths:
+            with open(path) as f:
+                markdowns.append(f.read())
+        nodes = [markdown_to_html_node(markdown) for markdown in markdowns]
+        pages = [
+            (path, os.path.join(tmp, "pages", f"{i}.html")) for i, path in enumerate(paths)
+        ]
+        argv = [
+            "/",
+            "--content", content,
+            "--static", static,
+            "--template", template,
+            "--output", output,
+            "--jobs", str(jobs),
+        ]
+
+        def full_build():
+            shutil.rmtree(output, ignore_errors=True)
+            build.main(argv)
+
+        results = {
+            "markdown_to_html_node": measure(
+                lambda: [markdown_to_html_node(markdown) for markdown in markdowns], repeat
+            ),
+            "to_html": measure(lambda: [node.to_html() for node in nodes], repeat),
+            "generate_page": measure(
+                quiet(lambda: [generate_page(p, d, BuildContext(template)) for p, d in pages]), repeat
+            ),
+            "main": measure(quiet(full_build), repeat),
+            "main_incremental": measure(quiet(lambda: build.main(argv)), repeat),
+        }
+        return {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "corpus": spec.to_dict(),
+            "bytes": sum(len(markdown) for markdown in markdowns),
+            "jobs": jobs,
+            "results": results,
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    print(f"{'benchmark':<24}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median"]
+        after = result["median"]
+        print(f"{name:<24}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms{after / before - 1:>+10.1%}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the site generator.")
+    add_corpus_arguments(parser, pages=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_suite(spec_from_args(args), args.repeat, args.jobs)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
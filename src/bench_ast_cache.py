@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import io
+import marshal
+import os
+import pickle
+import tempfile
+import time
+
+from ast_cache import AstCache
+from corpus import add_corpus_arguments, generate_corpus, spec_from_args
+from gencontent import BuildContext, generate_pages_recursive
+from htmlnode import node_from_tuple, node_to_tuple
+from markdown_blocks import markdown_to_html_node
+
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_decode(sources):
+    nodes = [markdown_to_html_node(source) for source in sources]
+    marshalled = [marshal.dumps(node_to_tuple(node)) for node in nodes]
+    pickled = [pickle.dumps(node, pickle.HIGHEST_PROTOCOL) for node in nodes]
+    expected = [node.to_html() for node in nodes]
+    if [node_from_tuple(marshal.loads(blob)).to_html() for blob in marshalled] != expected:
+        raise AssertionError("marshalled trees render differently")
+
+    parse = timed(lambda: [markdown_to_html_node(source).to_html() for source in sources])
+    unmarshal = timed(lambda: [node_from_tuple(marshal.loads(blob)).to_html() for blob in marshalled])
+    unpickle = timed(lambda: [pickle.loads(blob).to_html() for blob in pickled])
+    print(f"{len(sources)} pages, per page:")
+    print(f"  parse + to_html      {parse / len(sources) * 1000:8.3f} ms")
+    print(
+        f"  marshal + to_html    {unmarshal / len(sources) * 1000:8.3f} ms"
+        f"  ({sum(map(len, marshalled)) / len(sources) / 1024:.1f} KiB/page, {parse / unmarshal:.1f}x)"
+    )
+    print(
+        f"  pickle + to_html     {unpickle / len(sources) * 1000:8.3f} ms"
+        f"  ({sum(map(len, pickled)) / len(sources) / 1024:.1f} KiB/page, {parse / unpickle:.1f}x)"
+    )
+
+
+def bench_template_change(content, root):
+    template_path = os.path.join(root, "template.html")
+    ast_cache = AstCache.open(os.path.join(root, "cache"))
+
+    def rebuild(name, cache):
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE.replace("<body>", f"<body class='{name}'>"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return timed(
+                lambda: generate_pages_recursive(content, os.path.join(root, name), BuildContext(template_path, ast_cache=cache))
+            )
+
+    rebuild("warm", ast_cache)
+    ast_cache.hits = ast_cache.misses = 0
+    uncached = rebuild("uncached", None)
+    cached = rebuild("cached", ast_cache)
+    print("template-only rebuild:")
+    print(f"  full parse           {uncached:8.3f} s")
+    print(f"  ast cache            {cached:8.3f} s  ({uncached / cached:.1f}x, {ast_cache})")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the parsed-tree cache.")
+    add_corpus_arguments(parser, pages=500)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        paths = generate_corpus(content, spec_from_args(args))
+        sources = []
+        for path in paths:
+            with open(path) as f:
+                sources.append(f.read())
+        bench_decode(sources)
+        bench_template_change(content, root)
+
+
+if __name__ == "__main__":
+    main()
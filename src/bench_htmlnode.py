@@ -0,0 +1,62 @@
+import sys
+import timeit
+
+from htmlnode import LeafNode, ParentNode
+
+
+def recursive_to_html(node):
+    if isinstance(node, LeafNode):
+        return node.to_html()
+    children_html = ""
+    for child in node.children:
+        children_html += recursive_to_html(child)
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
+
+
+def wide_tree(paragraphs=2000, leaves=20):
+    return ParentNode(
+        "div",
+        [
+            ParentNode(
+                "p",
+                [
+                    LeafNode("b" if i % 2 else None, f"text {i} ")
+                    for i in range(leaves)
+                ],
+            )
+            for _ in range(paragraphs)
+        ],
+    )
+
+
+def deep_tree(depth=500):
+    node = LeafNode(None, "bottom")
+    for i in range(depth):
+        node = ParentNode("blockquote", [LeafNode("b", f"level {i}"), node])
+    return node
+
+
+def bench(name, node, number):
+    expected = recursive_to_html(node)
+    if node.to_html() != expected:
+        raise AssertionError(f"{name}: output differs from recursive serializer")
+    recursive = min(timeit.repeat(lambda: recursive_to_html(node), number=number, repeat=5))
+    iterative = min(timeit.repeat(node.to_html, number=number, repeat=5))
+    print(
+        f"{name:<6} recursive {recursive / number * 1000:8.3f} ms"
+        f"  iterative {iterative / number * 1000:8.3f} ms"
+        f"  speed-up {recursive / iterative:5.2f}x"
+    )
+
+
+def main():
+    bench("wide", wide_tree(), 10)
+    bench("deep", deep_tree(), 200)
+
+    depth = sys.getrecursionlimit() * 2
+    html = deep_tree(depth).to_html()
+    print(f"depth {depth}: {len(html)} characters without hitting the recursion limit")
+
+
+if __name__ == "__main__":
+    main()
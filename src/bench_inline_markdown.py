@@ -0,0 +1,49 @@
+import timeit
+
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType
+
+
+SENTENCE = (
+    "This is **bold text** with an _italic_ word, a `code span`, "
+    "an ![image](/images/tom.png) and a [link](/blog/tom) in it. "
+)
+
+
+def split_pipeline(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    return split_nodes_link(nodes)
+
+
+def bench(sentences, number):
+    text = SENTENCE * sentences
+    if split_pipeline(text) != text_to_textnodes(text):
+        raise AssertionError("scanner output differs from split pipeline")
+    staged = min(timeit.repeat(lambda: split_pipeline(text), number=number, repeat=5))
+    scanner = min(timeit.repeat(lambda: text_to_textnodes(text), number=number, repeat=5))
+    megabytes = len(text) * number / 1_000_000
+    print(
+        f"{len(text):>8} chars  split pipeline {megabytes / staged:7.2f} MB/s"
+        f"  scanner {megabytes / scanner:7.2f} MB/s"
+        f"  speed-up {staged / scanner:5.2f}x"
+    )
+
+
+def main():
+    bench(1, 2000)
+    bench(50, 100)
+    bench(1000, 5)
+
+
+if __name__ == "__main__":
+    main()
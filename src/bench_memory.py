@@ -0,0 +1,74 @@
+import tracemalloc
+
+from htmlnode import LeafNode
+from inline_markdown import text_to_textnodes
+from markdown_blocks import markdown_to_html_node
+from textnode import TextNode
+
+
+PARAGRAPH = (
+    "This is **bold text** with an _italic_ word, a `code span`, "
+    "an ![image](/images/tom.png) and a [link](/blog/tom) in it."
+)
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+def generate_corpus(paragraphs):
+    return "\n\n".join(f"{PARAGRAPH} Paragraph {i}." for i in range(paragraphs))
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def compare(name, slotted, legacy, fields):
+    slotted_bytes, _ = allocated(lambda: [slotted(*f) for f in fields])
+    legacy_bytes, _ = allocated(lambda: [legacy(*f) for f in fields])
+    print(
+        f"{name:<9} {len(fields)} nodes  __dict__ {legacy_bytes / len(fields):6.1f} B/node"
+        f"  __slots__ {slotted_bytes / len(fields):6.1f} B/node"
+        f"  saved {1 - slotted_bytes / legacy_bytes:5.1%}"
+    )
+
+
+def main():
+    corpus = generate_corpus(20000)
+
+    text_fields = []
+    for paragraph in corpus.split("\n\n"):
+        for node in text_to_textnodes(paragraph):
+            text_fields.append((node.text, node.text_type, node.url))
+    compare("TextNode", TextNode, DictTextNode, text_fields)
+
+    leaf_fields = [("b", text, None) for text, _, _ in text_fields]
+    compare("LeafNode", LeafNode, DictLeafNode, leaf_fields)
+
+    long_paragraph = " ".join([PARAGRAPH] * 50)
+    total, _ = allocated(lambda: [text_to_textnodes(long_paragraph) for _ in range(1000)])
+    print(f"text_to_textnodes on 1000 x {len(long_paragraph)}-char paragraphs: {total / 1_000_000:.2f} MB retained")
+
+    total, _ = allocated(lambda: markdown_to_html_node(corpus))
+    print(f"markdown_to_html_node on {len(corpus)} chars: {total / 1_000_000:.1f} MB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fsutil import atomic_open
+
+
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".svg", ".json", ".xml")
+GZIP_SUFFIX = ".gz"
+GZIP_LEVEL = 9
+INCOMPRESSIBLE_PREFIX = "incompressible:"
+
+
+class CompressStats:
+    def __init__(self):
+        self.compressed = 0
+        self.compressed_bytes = 0
+        self.gzip_bytes = 0
+        self.skipped = 0
+        self.incompressible = 0
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def __repr__(self):
+        return (
+            f"compressed {self.compressed} files ({self.compressed_bytes} -> {self.gzip_bytes} bytes), "
+            f"skipped {self.skipped} unchanged, {self.incompressible} not worth compressing"
+        )
+
+
+def compress_outputs(manifest, stats=None, workers=0):
+    if stats is None:
+        stats = CompressStats()
+    targets = [
+        (os.path.join(manifest.root, *key.split("/")), digest)
+        for key, digest in sorted(manifest.seen.items())
+        if key.endswith(COMPRESSIBLE_SUFFIXES)
+    ]
+
+    def compress(target):
+        return compress_output(target[0], target[1], manifest)
+
+    if workers == 1:
+        results = map(compress, targets)
+        report_compression(targets, results, manifest, stats)
+    else:
+        with ThreadPoolExecutor(max_workers=workers or None) as executor:
+            report_compression(targets, executor.map(compress, targets), manifest, stats)
+    return stats
+
+
+def compress_output(path, digest, manifest):
+    gz_path = path + GZIP_SUFFIX
+    previous = manifest.previous(gz_path)
+    if previous == INCOMPRESSIBLE_PREFIX + digest:
+        return "skipped", 0, 0
+    if previous == digest and os.path.exists(gz_path):
+        return "skipped", 0, 0
+
+    with open(path, "rb") as f:
+        data = f.read()
+    compressed = gzip.compress(data, GZIP_LEVEL, mtime=0)
+    if len(compressed) >= len(data):
+        if os.path.exists(gz_path):
+            os.remove(gz_path)
+        return "incompressible", len(data), 0
+    with atomic_open(gz_path, "wb") as f:
+        f.write(compressed)
+    return "compressed", len(data), len(compressed)
+
+
+def report_compression(targets, results, manifest, stats):
+    for (path, digest), (result, size, gz_size) in zip(targets, results):
+        gz_path = path + GZIP_SUFFIX
+        if result == "skipped":
+            stats.skipped += 1
+            manifest.record(gz_path, manifest.previous(gz_path))
+        elif result == "incompressible":
+            stats.incompressible += 1
+            manifest.record(gz_path, INCOMPRESSIBLE_PREFIX + digest)
+        else:
+            manifest.record(gz_path, digest)
+            stats.compressed += 1
+            stats.compressed_bytes += size
+            stats.gzip_bytes += gz_size
@@ -1,26 +1,157 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+from fingerprint import fingerprint_files
+from fsutil import PREVIOUS_SUFFIX, STAGING_SUFFIX, same_stat
 
-def copy_files_recursive(source_dir_path, dest_dir_path):
-    if not os.path.exists(dest_dir_path):
-        os.mkdir(dest_dir_path)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
-    exclude_list = [
-        "public", "docs", ".git", "src", 
-        "build.sh", "main.sh", "test.sh", 
-        "template.html", ".gitignore", 
-        "content"
-    ]
 
-    for filename in os.listdir(source_dir_path):
-        if filename in exclude_list:
+FICLONE = 0x40049409
+PUBLISH_MODES = ["copy", "hardlink", "reflink"]
+
+EXCLUDE_LIST = [
+    "public", "docs", ".git", ".cache", "src", 
+    "build.sh", "main.sh", "test.sh", "bench.sh", "dev.sh",
+    "template.html", ".gitignore", 
+    "content"
+]
+
+
+class CopyStats:
+    def __init__(self):
+        self.copied = 0
+        self.copied_bytes = 0
+        self.skipped = 0
+        self.skipped_bytes = 0
+        self.linked = 0
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def record_published(self, method, size):
+        self.copied += 1
+        self.copied_bytes += size
+        if method != "copy":
+            self.linked += 1
+
+    def __repr__(self):
+        return (
+            f"copied {self.copied} files ({self.copied_bytes} bytes, {self.linked} linked), "
+            f"skipped {self.skipped} unchanged files ({self.skipped_bytes} bytes)"
+        )
+
+
+def copy_files_recursive(
+    source_dir_path, dest_dir_path, manifest=None, stats=None, mode="copy", workers=1, asset_urls=None,
+    dir_path_public=None,
+):
+    if stats is None:
+        stats = CopyStats()
+    dirs, files = find_static_files(source_dir_path, dest_dir_path, output_dirs(dir_path_public or dest_dir_path))
+    if asset_urls is not None:
+        files = fingerprint_files(files, dest_dir_path, asset_urls, manifest)
+    for dir_path in dirs:
+        os.makedirs(dir_path, exist_ok=True)
+
+    def publish(paths):
+        return publish_static_file(paths[0], paths[1], manifest, mode)
+
+    if workers == 1:
+        results = map(publish, files)
+        report_copies(files, results, manifest, stats)
+    else:
+        with ThreadPoolExecutor(max_workers=workers or None) as executor:
+            report_copies(files, executor.map(publish, files), manifest, stats)
+    return stats
+
+
+def output_dirs(dir_path_public):
+    dir_path_public = os.path.realpath(dir_path_public)
+    return {dir_path_public, dir_path_public + STAGING_SUFFIX, dir_path_public + PREVIOUS_SUFFIX}
+
+
+def find_static_files(source_dir_path, dest_dir_path, excluded_dirs=()):
+    dirs = [dest_dir_path]
+    files = []
+    for filename in sorted(os.listdir(source_dir_path)):
+        if filename in EXCLUDE_LIST:
             continue
             
         from_path = os.path.join(source_dir_path, filename)
         dest_path = os.path.join(dest_dir_path, filename)
-        print(f" * {from_path} -> {dest_path}")
         if os.path.isfile(from_path):
-            shutil.copy(from_path, dest_path)
+            files.append((from_path, dest_path))
+        elif os.path.realpath(from_path) not in excluded_dirs:
+            sub_dirs, sub_files = find_static_files(from_path, dest_path, excluded_dirs)
+            dirs.extend(sub_dirs)
+            files.extend(sub_files)
+    return dirs, files
+
+
+def report_copies(files, results, manifest, stats):
+    for (from_path, dest_path), (method, digest, size) in zip(files, results):
+        if method is None:
+            stats.skipped += 1
+            stats.skipped_bytes += size
+        else:
+            print(f" * {from_path} -> {dest_path}")
+            stats.record_published(method, size)
+        if manifest is not None:
+            manifest.record(dest_path, digest)
+
+
+def publish_static_file(from_path, dest_path, manifest=None, mode="copy"):
+    if manifest is None:
+        return publish_file(from_path, dest_path, mode), None, os.path.getsize(from_path)
+    return sync_file(from_path, dest_path, manifest, mode)
+
+
+def sync_file(from_path, dest_path, manifest, mode="copy"):
+    source = os.stat(from_path)
+    digest = manifest.previous(dest_path)
+    if digest is None or not same_stat(source, dest_path):
+        digest = manifest.hash_file(from_path)
+        if manifest.is_fresh(dest_path, digest) and same_size(source, dest_path):
+            shutil.copystat(from_path, dest_path)
         else:
-            copy_files_recursive(from_path, dest_path)
\ No newline at end of file
+            return publish_file(from_path, dest_path, mode), digest, source.st_size
+    return None, digest, source.st_size
+
+
+def publish_file(from_path, dest_path, mode="copy"):
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    if mode == "hardlink":
+        try:
+            os.link(from_path, dest_path)
+            return "hardlink"
+        except OSError:
+            pass
+    elif mode == "reflink":
+        try:
+            reflink_file(from_path, dest_path)
+            return "reflink"
+        except OSError:
+            pass
+    shutil.copy2(from_path, dest_path)
+    return "copy"
+
+
+def reflink_file(from_path, dest_path):
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    with open(from_path, "rb") as source, open(dest_path, "wb") as dest:
+        fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+    shutil.copystat(from_path, dest_path)
+
+
+def same_size(source, dest_path):
+    try:
+        return os.stat(dest_path).st_size == source.st_size
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+
+
+WORDS = [
+    "hobbit", "ring", "shire", "wizard", "elf", "dwarf", "mountain", "river",
+    "forest", "tower", "road", "king", "sword", "song", "journey", "shadow",
+    "light", "council", "friend", "return", "ancient", "silver", "golden", "quiet",
+]
+
+
+class CorpusSpec:
+    def __init__(
+        self,
+        pages=100,
+        paragraphs=5,
+        paragraph_length=60,
+        list_items=5,
+        quote_depth=2,
+        link_density=0.1,
+        image_density=0.02,
+        seed=0,
+    ):
+        self.pages = pages
+        self.paragraphs = paragraphs
+        self.paragraph_length = paragraph_length
+        self.list_items = list_items
+        self.quote_depth = quote_depth
+        self.link_density = link_density
+        self.image_density = image_density
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def generate_corpus(dest_dir_path, spec):
+    rng = random.Random(spec.seed)
+    paths = []
+    for i in range(spec.pages):
+        page_dir = os.path.join(dest_dir_path, f"section{i // 100}", f"page{i}")
+        if i == 0:
+            page_dir = dest_dir_path
+        os.makedirs(page_dir, exist_ok=True)
+        path = os.path.join(page_dir, "index.md")
+        with open(path, "w") as f:
+            f.write(generate_page(rng, spec, i))
+        paths.append(path)
+    return paths
+
+
+def generate_page(rng, spec, index):
+    blocks = [f"# Page {index}: {sentence(rng, 4).capitalize()}"]
+    for i in range(spec.paragraphs):
+        blocks.append(paragraph(rng, spec))
+        if i % 3 == 0:
+            blocks.append(f"## {sentence(rng, 3).capitalize()}")
+        if i % 3 == 1 and spec.list_items:
+            blocks.append(unordered_list(rng, spec))
+        if i % 3 == 2 and spec.list_items:
+            blocks.append(ordered_list(rng, spec))
+    if spec.quote_depth:
+        blocks.append(quote(rng, spec))
+    blocks.append(f"```\n{sentence(rng, 8)}\n{sentence(rng, 8)}\n```")
+    return "\n\n".join(blocks) + "\n"
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def inline_words(rng, spec, words):
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < spec.image_density:
+            parts.append(f"![{word}](/images/{word}.png)")
+        elif roll < spec.image_density + spec.link_density:
+            parts.append(f"[{word}](/section0/page{rng.randrange(spec.pages)})")
+        elif roll < 0.85:
+            parts.append(word)
+        elif roll < 0.9:
+            parts.append(f"**{word}**")
+        elif roll < 0.95:
+            parts.append(f"_{word}_")
+        else:
+            parts.append(f"`{word}`")
+    return " ".join(parts)
+
+
+def paragraph(rng, spec):
+    lines = []
+    remaining = spec.paragraph_length
+    while remaining > 0:
+        words = min(12, remaining)
+        lines.append(inline_words(rng, spec, words))
+        remaining -= words
+    return "\n".join(lines)
+
+
+def unordered_list(rng, spec):
+    return "\n".join(f"- {inline_words(rng, spec, 6)}" for _ in range(spec.list_items))
+
+
+def ordered_list(rng, spec):
+    return "\n".join(
+        f"{i + 1}. {inline_words(rng, spec, 6)}" for i in range(spec.list_items)
+    )
+
+
+def quote(rng, spec):
+    return "\n".join(
+        ">" * (depth + 1) + " " + inline_words(rng, spec, 8)
+        for depth in range(spec.quote_depth)
+    )
+
+
+def add_corpus_arguments(parser, pages=100):
+    parser.add_argument("--pages", type=int, default=pages)
+    parser.add_argument("--paragraphs", type=int, default=5)
+    parser.add_argument("--paragraph-length", type=int, default=60)
+    parser.add_argument("--list-items", type=int, default=5)
+    parser.add_argument("--quote-depth", type=int, default=2)
+    parser.add_argument("--link-density", type=float, default=0.1)
+    parser.add_argument("--image-density", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate a synthetic content/ tree.")
+    parser.add_argument("dest", help="directory to write the markdown pages into")
+    add_corpus_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def spec_from_args(args):
+    return CorpusSpec(
+        pages=args.pages,
+        paragraphs=args.paragraphs,
+        paragraph_length=args.paragraph_length,
+        list_items=args.list_items,
+        quote_depth=args.quote_depth,
+        link_density=args.link_density,
+        image_density=args.image_density,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = generate_corpus(args.dest, spec_from_args(args))
+    print(f"Generated {len(paths)} pages in {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from copystatic import EXCLUDE_LIST
+from fsutil import PREVIOUS_SUFFIX, STAGING_SUFFIX
+from gencontent import split_page
+from markdown_blocks import markdown_to_html_node
+from template import load_template
+
+
+dir_path_static = ".."
+dir_path_content = "../content"
+template_path = "../template.html"
+
+
+class PageRenderer:
+    def __init__(self, dir_path_content, template_path, basepath="/", max_pages=256):
+        self.dir_path_content = dir_path_content
+        self.template_path = template_path
+        self.basepath = basepath
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def find_source(self, url_path):
+        parts = [part for part in url_path.split("/") if part not in ("", ".")]
+        if ".." in parts:
+            return None
+        if parts and parts[-1] == "index.html":
+            parts = parts[:-1]
+        md_path = os.path.join(self.dir_path_content, *parts, "index.md")
+        if os.path.isfile(md_path):
+            return md_path
+        return None
+
+    def render(self, md_path):
+        stat = os.stat(md_path)
+        template = load_template(self.template_path, self.basepath)
+        key = (stat.st_mtime_ns, stat.st_size, template)
+        with self.lock:
+            cached = self.pages.get(md_path)
+            if cached is not None and cached[0] == key:
+                self.pages.move_to_end(md_path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        with open(md_path, "r") as f:
+            markdown_content = f.read()
+        title, body = split_page(markdown_content)
+        html = markdown_to_html_node(body).to_html()
+        page = template.render(Title=title, Content=html).encode("utf-8")
+
+        with self.lock:
+            self.pages[md_path] = (key, page)
+            self.pages.move_to_end(md_path)
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        return page
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        self.serve(head=False)
+
+    def do_HEAD(self):
+        self.serve(head=True)
+
+    def serve(self, head):
+        url_path = unquote(urlsplit(self.path).path)
+        renderer = self.server.renderer
+        md_path = renderer.find_source(url_path)
+        if md_path is None:
+            if is_excluded(url_path):
+                self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                return
+            if head:
+                super().do_HEAD()
+            else:
+                super().do_GET()
+            return
+
+        try:
+            body = renderer.render(md_path)
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+def is_excluded(url_path):
+    for part in posixpath.normpath(url_path).split("/"):
+        if part in EXCLUDE_LIST or part.endswith((STAGING_SUFFIX, PREVIOUS_SUFFIX)):
+            return True
+        if part.startswith(".") and part not in (".", ".."):
+            return True
+    return False
+
+
+def make_server(renderer, dir_path_static, bind="127.0.0.1", port=8888):
+    handler = partial(DevRequestHandler, directory=dir_path_static)
+    server = ThreadingHTTPServer((bind, port), handler)
+    server.renderer = renderer
+    return server
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Serve the site, rendering pages on request.")
+    parser.add_argument("--content", default=dir_path_content, help="markdown source directory")
+    parser.add_argument("--static", default=dir_path_static, help="static asset directory")
+    parser.add_argument("--template", default=template_path, help="page template")
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--cache-size", type=int, default=256, help="rendered pages to keep in memory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    renderer = PageRenderer(args.content, args.template, max_pages=args.cache_size)
+    server = make_server(renderer, args.static, args.bind, args.port)
+    print(f"Serving {args.content} on http://{args.bind}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Stopped ({renderer.hits} cache hits, {renderer.misses} renders)")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
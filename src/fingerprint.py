@@ -0,0 +1,76 @@
+import json
+import os
+import re
+
+from fsutil import atomic_open, same_stat
+from manifest import hash_file
+
+
+ASSETS_FILENAME = ".assets.json"
+FINGERPRINT_LENGTH = 10
+FINGERPRINT_SUFFIXES = (
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico",
+    ".woff", ".woff2", ".ttf",
+)
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{%d}\.[^./]+$" % FINGERPRINT_LENGTH)
+
+
+def fingerprint_name(path, digest):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def is_fingerprinted(path):
+    return FINGERPRINT_PATTERN.search(path) is not None
+
+
+def can_fingerprint(path):
+    return path.lower().endswith(FINGERPRINT_SUFFIXES)
+
+
+def asset_url(path, root):
+    return "/" + os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def fingerprint_files(files, dest_dir_path, asset_urls, manifest=None):
+    previous_urls = load_asset_urls(dest_dir_path) if manifest is not None else {}
+    fingerprinted = []
+    for from_path, dest_path in files:
+        if can_fingerprint(dest_path):
+            url = asset_url(dest_path, dest_dir_path)
+            hashed_path = previous_fingerprint(from_path, dest_dir_path, previous_urls.get(url), manifest)
+            if hashed_path is None:
+                digest = manifest.hash_file(from_path) if manifest is not None else hash_file(from_path)
+                hashed_path = fingerprint_name(dest_path, digest)
+            asset_urls[url] = asset_url(hashed_path, dest_dir_path)
+            dest_path = hashed_path
+        fingerprinted.append((from_path, dest_path))
+    return fingerprinted
+
+
+def previous_fingerprint(from_path, dest_dir_path, hashed_url, manifest):
+    if hashed_url is None:
+        return None
+    hashed_path = os.path.join(dest_dir_path, *hashed_url[1:].split("/"))
+    if manifest.previous(hashed_path) is None or not same_stat(os.stat(from_path), hashed_path):
+        return None
+    return hashed_path
+
+
+def load_asset_urls(dir_path):
+    path = os.path.join(dir_path, ASSETS_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_asset_urls(dir_path, asset_urls):
+    path = os.path.join(dir_path, ASSETS_FILENAME)
+    if asset_urls is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    os.makedirs(dir_path, exist_ok=True)
+    with atomic_open(path) as f:
+        json.dump(asset_urls, f, indent=2, sort_keys=True)
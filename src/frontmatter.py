@@ -0,0 +1,62 @@
+import os
+from itertools import chain
+
+
+FRONT_MATTER_DELIMITER = "---"
+
+
+def parse_front_matter(lines):
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return {}, lines
+    if first.rstrip() != FRONT_MATTER_DELIMITER:
+        return {}, chain([first], lines)
+    header = []
+    for line in lines:
+        if line.rstrip() == FRONT_MATTER_DELIMITER:
+            return parse_header(header), lines
+        header.append(line)
+    return {}, chain([first], header)
+
+
+def parse_header(lines):
+    metadata = {}
+    for line in lines:
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+        key, separator, value = line.partition(":")
+        if separator == "" or key.strip() == "":
+            raise ValueError(f"invalid front matter line: {line}")
+        metadata[key.strip()] = value.strip()
+    return metadata
+
+
+def split_front_matter(markdown):
+    if not markdown.startswith(FRONT_MATTER_DELIMITER):
+        return {}, markdown
+    metadata, lines = parse_front_matter(markdown.splitlines(keepends=True))
+    return metadata, "".join(lines)
+
+
+def read_metadata(path):
+    with open(path, "r") as f:
+        metadata, lines = parse_front_matter(f)
+        if metadata.get("title"):
+            return metadata
+        for line in lines:
+            if line.startswith("# "):
+                metadata["title"] = line[2:].rstrip("\n")
+                break
+    return metadata
+
+
+def iter_metadata(dir_path_content):
+    for filename in sorted(os.listdir(dir_path_content)):
+        path = os.path.join(dir_path_content, filename)
+        if os.path.isfile(path):
+            if path.endswith(".md"):
+                yield path, read_metadata(path)
+        else:
+            yield from iter_metadata(path)
@@ -0,0 +1,113 @@
+import ctypes
+import errno
+import os
+import shutil
+from contextlib import contextmanager
+
+try:
+    renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+except (AttributeError, OSError, TypeError):
+    renameat2 = None
+
+
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+EXCHANGE_UNSUPPORTED = (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP)
+
+
+@contextmanager
+def atomic_open(path, mode="w"):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    f = open(tmp_path, mode)
+    try:
+        yield f
+        f.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+
+
+def link_tree(source_dir_path, dest_dir_path):
+    os.makedirs(dest_dir_path, exist_ok=True)
+    for entry in os.scandir(source_dir_path):
+        dest_path = os.path.join(dest_dir_path, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            link_tree(entry.path, dest_path)
+            continue
+        try:
+            os.link(entry.path, dest_path, follow_symlinks=False)
+        except OSError:
+            shutil.copy2(entry.path, dest_path, follow_symlinks=False)
+
+
+def prepare_staging(dir_path_public, seed=True):
+    staging = dir_path_public + STAGING_SUFFIX
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    if seed and os.path.isdir(dir_path_public):
+        link_tree(dir_path_public, staging)
+    else:
+        os.makedirs(staging)
+    return staging
+
+
+def discard_staging(dir_path_public):
+    staging = dir_path_public + STAGING_SUFFIX
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+
+
+def exchange_paths(path_a, path_b):
+    if renameat2 is None:
+        raise OSError(errno.ENOSYS, "atomic exchange is not supported on this platform", path_a, path_b)
+    if renameat2(AT_FDCWD, os.fsencode(path_a), AT_FDCWD, os.fsencode(path_b), RENAME_EXCHANGE) != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error), path_a, path_b)
+
+
+def replace_dir(dir_path, new_dir_path, old_dir_path):
+    if not os.path.exists(dir_path):
+        os.rename(new_dir_path, dir_path)
+        return
+    try:
+        exchange_paths(new_dir_path, dir_path)
+    except OSError as e:
+        if e.errno not in EXCHANGE_UNSUPPORTED:
+            raise
+        os.rename(dir_path, old_dir_path)
+        os.rename(new_dir_path, dir_path)
+        return
+    os.rename(new_dir_path, old_dir_path)
+
+
+def swap_into_place(dir_path_public):
+    staging = dir_path_public + STAGING_SUFFIX
+    previous = dir_path_public + PREVIOUS_SUFFIX
+    if os.path.exists(previous):
+        shutil.rmtree(previous)
+    replace_dir(dir_path_public, staging, previous)
+
+
+def rollback(dir_path_public):
+    previous = dir_path_public + PREVIOUS_SUFFIX
+    if not os.path.isdir(previous):
+        raise FileNotFoundError(f"no previous build at {previous}")
+    current = dir_path_public + STAGING_SUFFIX
+    if os.path.exists(current):
+        shutil.rmtree(current)
+    replace_dir(dir_path_public, previous, current)
+    if os.path.exists(current):
+        os.rename(current, previous)
+
+
+def same_stat(source, dest_path):
+    try:
+        dest = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    return dest.st_size == source.st_size and dest.st_mtime_ns == source.st_mtime_ns
@@ -1,51 +1,287 @@
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from markdown_blocks import markdown_to_html_node
+from frontmatter import parse_front_matter, split_front_matter
+from fsutil import atomic_open
+from htmlnode import ParentNode
+from markdown_blocks import (
+    BlockCache, block_lines_to_html_node, iter_block_lines, iter_markdown_html, markdown_to_html_node,
+)
+from profiling import NULL_TIMER, BuildProfile, StageTimer
+from render_cache import RenderCache
+from template import load_template
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+PAGES_PER_BATCH = 64
+
+_worker_block_cache = None
+_worker_render_cache = None
+
+
+class BuildContext:
+    def __init__(
+        self, template_path, basepath="/", manifest=None, profile=None, asset_urls=None, block_cache=None,
+        render_cache=None, ast_cache=None, sitemap=None,
+    ):
+        self.template_path = template_path
+        self.basepath = basepath
+        self.manifest = manifest
+        self.profile = profile
+        self.asset_urls = asset_urls
+        self.block_cache = block_cache
+        self.render_cache = render_cache
+        self.ast_cache = ast_cache
+        self.sitemap = sitemap
+
+    @property
+    def caches(self):
+        return self.block_cache, self.render_cache, self.ast_cache
+
+    def template(self):
+        return load_template(self.template_path, self.basepath, self.asset_urls)
+
+    def timer(self):
+        return StageTimer() if self.profile is not None else NULL_TIMER
+
+    def page_digest(self, from_path, refs=()):
+        return self.manifest.page_digest(from_path, self.template_path, self.basepath, self.asset_urls, refs)
+
+    def previous_refs(self, dest_path):
+        if self.manifest is None:
+            return []
+        return self.manifest.previous_refs(dest_path)
+
+    def is_fresh(self, from_path, dest_path, refs):
+        if self.manifest is None:
+            return False
+        return self.manifest.is_fresh(dest_path, self.page_digest(from_path, refs))
+
+    def record_page(self, from_path, dest_path, refs=()):
+        if self.manifest is not None:
+            self.manifest.record(dest_path, self.page_digest(from_path, refs), refs)
+        if self.sitemap is not None:
+            self.sitemap.add(dest_path, from_path)
+
+    def __getstate__(self):
+        return {
+            "template_path": self.template_path,
+            "basepath": self.basepath,
+            "timed": self.profile is not None,
+            "asset_urls": self.asset_urls,
+            "block_cache_size": self.block_cache.max_blocks if self.block_cache is not None else 0,
+            "render_cache_path": self.render_cache.path if self.render_cache is not None else None,
+            "ast_cache": self.ast_cache,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(
+            state["template_path"],
+            state["basepath"],
+            profile=BuildProfile() if state["timed"] else None,
+            asset_urls=state["asset_urls"],
+            block_cache=worker_block_cache(state["block_cache_size"]),
+            render_cache=worker_render_cache(state["render_cache_path"]),
+            ast_cache=state["ast_cache"],
+        )
+
+
+def generate_pages_recursive(dir_path_content, dest_dir_path, context):
     for filename in os.listdir(dir_path_content):
         from_path = os.path.join(dir_path_content, filename)
         dest_path = os.path.join(dest_dir_path, filename)
         if os.path.isfile(from_path):
             if from_path.endswith('.md'):
                 dest_path = Path(dest_path).with_suffix(".html")
-                generate_page(from_path, template_path, dest_path, basepath)
+                refs = context.previous_refs(dest_path)
+                if not context.is_fresh(from_path, dest_path, refs):
+                    refs = generate_page(from_path, dest_path, context)
+                context.record_page(from_path, dest_path, refs)
         else:
             os.makedirs(dest_path, exist_ok=True)
-            generate_pages_recursive(from_path, template_path, dest_path, basepath)
+            generate_pages_recursive(from_path, dest_path, context)
 
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
-    print(f" * {from_path} {template_path} -> {dest_path}")
-    from_file = open(from_path, "r")
-    markdown_content = from_file.read()
-    from_file.close()
+def find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for filename in sorted(os.listdir(dir_path_content)):
+        from_path = os.path.join(dir_path_content, filename)
+        dest_path = os.path.join(dest_dir_path, filename)
+        if os.path.isfile(from_path):
+            if from_path.endswith('.md'):
+                pages.append((from_path, Path(dest_path).with_suffix(".html")))
+        else:
+            pages.extend(find_pages(from_path, dest_path))
+    return pages
 
-    template_file = open(template_path, "r")
-    template = template_file.read()
-    template_file.close()
 
-    node = markdown_to_html_node(markdown_content)
-    html = node.to_html()
+def generate_pages_parallel(dir_path_content, dest_dir_path, context, jobs=None):
+    pages = []
+    for from_path, dest_path in find_pages(dir_path_content, dest_dir_path):
+        refs = context.previous_refs(dest_path)
+        if context.is_fresh(from_path, dest_path, refs):
+            context.record_page(from_path, dest_path, refs)
+            continue
+        pages.append((from_path, dest_path))
+
+    workers = jobs or os.cpu_count() or 1
+    batch_size = max(1, min(PAGES_PER_BATCH, len(pages) // (workers * 4)))
+    batches = [
+        pages[i : i + batch_size] for i in range(0, len(pages), batch_size)
+    ]
+    errors = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(generate_page_batch, batches, [context] * len(batches))
+        for batch, (batch_errors, batch_timings, batch_refs, batch_counts) in zip(batches, results):
+            for cache, (hits, misses) in zip(context.caches, batch_counts):
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+            for from_path, dest_path in batch:
+                if from_path in batch_errors:
+                    print(f" ! {from_path}: {batch_errors[from_path]}")
+                    errors.append((from_path, batch_errors[from_path]))
+                    continue
+                print(f" * {from_path} {context.template_path} -> {dest_path}")
+                if context.profile is not None:
+                    context.profile.record_page(from_path, batch_timings[from_path])
+                context.record_page(from_path, dest_path, batch_refs[from_path])
+    return errors
+
 
-    title = extract_title(markdown_content)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
+def generate_page_batch(pages, context):
+    errors = {}
+    timings = {}
+    refs = {}
+    before = [cache_counts(cache) for cache in context.caches]
+    for from_path, dest_path in pages:
+        timer = context.timer()
+        try:
+            refs[from_path] = render_page(from_path, dest_path, context, timer)
+            timings[from_path] = timer.stages
+        except Exception as e:
+            errors[from_path] = f"{type(e).__name__}: {e}"
+    counts = [
+        (hits - old_hits, misses - old_misses)
+        for (hits, misses), (old_hits, old_misses) in zip(map(cache_counts, context.caches), before)
+    ]
+    return errors, timings, refs, counts
 
-    template = template.replace('href="/', f'href="{basepath}')
-    template = template.replace('src="/', f'src="{basepath}')
 
+def cache_counts(cache):
+    if cache is None:
+        return 0, 0
+    return cache.hits, cache.misses
+
+
+def worker_block_cache(max_blocks):
+    global _worker_block_cache
+    if max_blocks <= 0:
+        return None
+    if _worker_block_cache is None or _worker_block_cache.max_blocks != max_blocks:
+        _worker_block_cache = BlockCache(max_blocks)
+    return _worker_block_cache
+
+
+def worker_render_cache(path):
+    global _worker_render_cache
+    if path is None:
+        return None
+    if _worker_render_cache is None or _worker_render_cache.path != path:
+        _worker_render_cache = RenderCache(path)
+    return _worker_render_cache
+
+
+def generate_page(from_path, dest_path, context):
+    print(f" * {from_path} {context.template_path} -> {dest_path}")
+    timer = context.timer()
+    refs = render_page(from_path, dest_path, context, timer)
+    if context.profile is not None:
+        context.profile.record_page(from_path, timer.stages)
+    return refs
+
+
+def render_page(from_path, dest_path, context, timer=NULL_TIMER):
+    template = context.template()
+    refs = set() if context.asset_urls is not None else None
     dest_dir_path = os.path.dirname(dest_path)
     if dest_dir_path != "":
         os.makedirs(dest_dir_path, exist_ok=True)
-    to_file = open(dest_path, "w")
-    to_file.write(template)
+
+    if timer is NULL_TIMER and context.render_cache is None and context.ast_cache is None:
+        with open(from_path, "r") as from_file:
+            metadata, lines = parse_front_matter(from_file)
+            title = metadata.get("title") or extract_title_from_lines(lines)
+        with open(from_path, "r") as from_file, atomic_open(dest_path) as to_file:
+            _, lines = parse_front_matter(from_file)
+            template.write(to_file, refs, Title=title, Content=iter_markdown_html(lines, context.block_cache))
+        return sorted(refs or ())
+
+    with open(from_path, "r") as from_file:
+        markdown_content = from_file.read()
+    timer.lap("read")
+    title, html = render_article(markdown_content, context, timer)
+    page = template.render(refs, Title=title, Content=html)
+    timer.lap("template")
+    with atomic_open(dest_path) as to_file:
+        to_file.write(page)
+    timer.lap("write")
+    return sorted(refs or ())
+
+
+def render_article(markdown_content, context, timer=NULL_TIMER):
+    render_cache = context.render_cache
+    if render_cache is not None:
+        key = render_cache.key(markdown_content, context.basepath)
+        cached = render_cache.get(key)
+        if cached is not None:
+            timer.lap("cached render")
+            return cached
+    title, body = split_page(markdown_content)
+    if context.ast_cache is not None:
+        html = parse_cached(body, context.ast_cache).to_html()
+        timer.lap("cached render")
+    else:
+        html = render_markdown(body, context.block_cache, timer)
+    if render_cache is not None:
+        render_cache.put(key, title, html)
+    return title, html
+
+
+def render_markdown(markdown_content, block_cache=None, timer=NULL_TIMER):
+    blocks = list(iter_block_lines(io.StringIO(markdown_content)))
+    timer.lap("parse")
+    if block_cache is not None:
+        html = "".join(block_cache.render("\n".join(lines), block_type, lines) for block_type, lines in blocks)
+        timer.lap("blocks")
+        return "<div>" + html + "</div>"
+    node = ParentNode("div", [block_lines_to_html_node(block_type, lines) for block_type, lines in blocks])
+    timer.lap("inline")
+    html = node.to_html()
+    timer.lap("serialize")
+    return html
+
+
+def parse_cached(markdown_content, ast_cache):
+    key = ast_cache.key(markdown_content)
+    node = ast_cache.get(key)
+    if node is None:
+        node = markdown_to_html_node(markdown_content)
+        ast_cache.put(key, node)
+    return node
+
+
+def split_page(markdown_content):
+    metadata, body = split_front_matter(markdown_content)
+    return metadata.get("title") or extract_title(body), body
 
 
 def extract_title(md):
-    lines = md.split("\n")
+    return extract_title_from_lines(md.split("\n"))
+
+
+def extract_title_from_lines(lines):
     for line in lines:
         if line.startswith("# "):
-            return line[2:]
+            return line[2:].rstrip("\n")
     raise ValueError("no title found")
\ No newline at end of file
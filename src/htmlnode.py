@@ -1,4 +1,6 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,19 +10,25 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
 
+    def iter_html(self):
+        yield self.to_html()
+
+    def write_html(self, fp):
+        for chunk in self.iter_html():
+            fp.write(chunk)
+
     def props_to_html(self):
         if self.props is None:
             return ""
-        props_html = ""
-        for prop in self.props:
-            props_html += f' {prop}="{self.props[prop]}"'
-        return props_html
+        return "".join(f' {prop}="{self.props[prop]}"' for prop in self.props)
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, children: {self.children}, {self.props})"
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -36,18 +44,52 @@ class LeafNode(HTMLNode):
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        yield self.open_tag()
+        stack = [(self.tag, iter(self.children))]
+        while stack:
+            tag, children = stack[-1]
+            for child in children:
+                child_type = type(child)
+                if child_type is LeafNode:
+                    yield child.to_html()
+                elif child_type.iter_html is ParentNode.iter_html:
+                    yield child.open_tag()
+                    stack.append((child.tag, iter(child.children)))
+                    break
+                else:
+                    yield from child.iter_html()
+            else:
+                stack.pop()
+                yield f"</{tag}>"
+
+    def open_tag(self):
         if self.tag is None:
             raise ValueError("invalid HTML: no tag")
         if self.children is None:
             raise ValueError("invalid HTML: no children")
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        return f"<{self.tag}{self.props_to_html()}>"
 
     def __repr__(self):
-        return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
\ No newline at end of file
+        return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
+
+
+def node_to_tuple(node):
+    if isinstance(node, ParentNode):
+        return (node.tag, tuple(node_to_tuple(child) for child in node.children), node.props)
+    return (node.tag, node.value, node.props)
+
+
+def node_from_tuple(data):
+    tag, body, props = data
+    if isinstance(body, tuple):
+        return ParentNode(tag, [node_from_tuple(child) for child in body], props)
+    return LeafNode(tag, body, props)
@@ -3,17 +3,79 @@ import re
 from textnode import TextNode, TextType
 
 
-def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+DELIMITERS = [
+    ("**", TextType.BOLD),
+    ("_", TextType.ITALIC),
+    ("*", TextType.ITALIC),
+    ("`", TextType.CODE),
+]
+
+
+def text_to_textnodes(text, spans=None):
+    nodes = []
+    scan_delimited(text, 0, len(text), 0, nodes, spans)
     return nodes
 
 
+def scan_delimited(text, start, end, level, nodes, spans=None):
+    if level == len(DELIMITERS):
+        scan_images(text, start, end, nodes, spans)
+        return
+    delimiter, text_type = DELIMITERS[level]
+    inside = False
+    position = start
+    found = text.find(delimiter, position, end)
+    while found != -1:
+        if not inside:
+            scan_delimited(text, position, found, level + 1, nodes, spans)
+        elif found > position:
+            nodes.append(TextNode(text[position:found], text_type))
+            if spans is not None:
+                spans.append((position, found))
+        inside = not inside
+        position = found + len(delimiter)
+        found = text.find(delimiter, position, end)
+    if inside:
+        opened = position - len(delimiter)
+        raise ValueError(f"invalid markdown, formatted section not closed ({delimiter} at offset {opened})")
+    scan_delimited(text, position, end, level + 1, nodes, spans)
+
+
+def scan_images(text, start, end, nodes, spans=None):
+    if start >= end:
+        return
+    position = start
+    for match in IMAGE_PATTERN.finditer(text, start, end):
+        scan_links(text, position, match.start(), nodes, spans)
+        nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        if spans is not None:
+            spans.append(match.span(1))
+        position = match.end()
+    scan_links(text, position, end, nodes, spans)
+
+
+def scan_links(text, start, end, nodes, spans=None):
+    if start >= end:
+        return
+    position = start
+    for match in LINK_PATTERN.finditer(text, start, end):
+        if match.start() > position:
+            nodes.append(TextNode(text[position : match.start()], TextType.TEXT))
+            if spans is not None:
+                spans.append((position, match.start()))
+        nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        if spans is not None:
+            spans.append(match.span(1))
+        position = match.end()
+    if end > position:
+        nodes.append(TextNode(text[position:end], TextType.TEXT))
+        if spans is not None:
+            spans.append((position, end))
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
@@ -36,66 +98,36 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 
 def split_nodes_image(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        original_text = old_node.text
-        images = extract_markdown_images(original_text)
-        if len(images) == 0:
-            new_nodes.append(old_node)
-            continue
-        for image in images:
-            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, image section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(
-                TextNode(
-                    image[0],
-                    TextType.IMAGE,
-                    image[1],
-                )
-            )
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    return new_nodes
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 
 def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+
+def split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
-        original_text = old_node.text
-        links = extract_markdown_links(original_text)
-        if len(links) == 0:
+        text = old_node.text
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() > position:
+                new_nodes.append(TextNode(text[position : match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
+        if position == 0:
             new_nodes.append(old_node)
-            continue
-        for link in links:
-            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, link section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(link[0], TextType.LINK, link[1]))
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
+        elif len(text) > position:
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
     return new_nodes
 
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
\ No newline at end of file
+    return LINK_PATTERN.findall(text)
\ No newline at end of file
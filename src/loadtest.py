@@ -0,0 +1,129 @@
+import argparse
+import http.client
+import threading
+import time
+
+from staticserver import make_server
+
+
+dir_path_public = "../docs"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_worker(host, port, paths, count, headers, results):
+    connection = http.client.HTTPConnection(host, port)
+    latencies = []
+    errors = 0
+    transferred = 0
+    try:
+        for i in range(count):
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(host, port)
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            transferred += len(body)
+            if response.status >= 400:
+                errors += 1
+    finally:
+        connection.close()
+    results.append((latencies, errors, transferred))
+
+
+def run_load(host, port, paths, concurrency, requests, headers):
+    results = []
+    per_worker = max(1, requests // concurrency)
+    threads = [
+        threading.Thread(target=run_worker, args=(host, port, paths, per_worker, headers, results))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    return {
+        "requests": len(latencies),
+        "errors": sum(result[1] for result in results),
+        "bytes": sum(result[2] for result in results),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def format_report(stats):
+    return (
+        f"{stats['requests']} requests, {stats['errors']} errors in {stats['seconds']:.2f}s "
+        f"({stats['requests_per_second']:.0f} req/s, {stats['bytes'] / 1_000_000:.1f} MB)\n"
+        f"latency p50 {stats['p50_ms']:.2f}ms  p90 {stats['p90_ms']:.2f}ms  "
+        f"p99 {stats['p99_ms']:.2f}ms  max {stats['max_ms']:.2f}ms"
+    )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Load test the static server.")
+    parser.add_argument("paths", nargs="*", default=["/"], help="URL paths to request in turn")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="server to test; starts a local one if omitted")
+    parser.add_argument("--directory", default=dir_path_public, help="directory for the local server")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="concurrent connections")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="total requests")
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--etag", action="store_true", help="revalidate with If-None-Match")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    headers = {}
+    if args.gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    server = None
+    port = args.port
+    if port is None:
+        server = make_server(args.directory, args.host, 0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_port
+        print(f"Serving {args.directory} on http://{args.host}:{port}/")
+
+    try:
+        if args.etag:
+            connection = http.client.HTTPConnection(args.host, port)
+            connection.request("GET", args.paths[0], headers=headers)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            etag = response.getheader("ETag")
+            if etag is not None:
+                headers["If-None-Match"] = etag
+        stats = run_load(args.host, port, args.paths, args.concurrency, args.requests, headers)
+        print(format_report(stats))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,21 @@
+import argparse
+import cProfile
 import os
-import shutil
 import sys
+import tracemalloc
 
-from copystatic import copy_files_recursive
-from gencontent import generate_pages_recursive
+from ast_cache import AstCache
+from compress import compress_outputs
+from copystatic import PUBLISH_MODES, copy_files_recursive
+from fingerprint import save_asset_urls
+from fsutil import PREVIOUS_SUFFIX, discard_staging, prepare_staging, rollback, swap_into_place
+from gencontent import BuildContext, generate_pages_parallel, generate_pages_recursive
+from manifest import MANIFEST_FILENAME, Manifest
+from markdown_blocks import BlockCache
+from profiling import CPROFILE_FILENAME, PROFILE_FILENAME, BuildProfile, tracemalloc_summary
+from render_cache import RenderCache
+from sitemap import SITEMAP_FILENAME, Sitemap
+from watch import SiteWatcher
 
 
 dir_path_static = ".."
@@ -11,18 +23,256 @@ dir_path_public = "../docs"
 dir_path_content = "../content"
 template_path = "../template.html"
 
-basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
 
-def main():
-    print("Deleting public directory...")
-    if os.path.exists(dir_path_public):
-        shutil.rmtree(dir_path_public)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--content", default=dir_path_content, help="markdown source directory")
+    parser.add_argument("--static", default=dir_path_static, help="static asset directory")
+    parser.add_argument("--template", default=template_path, help="page template")
+    parser.add_argument("--output", default=dir_path_public, help="build output directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes for page generation (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--assets",
+        choices=PUBLISH_MODES,
+        default="copy",
+        help="how to publish static assets; hardlink and reflink fall back to copying per file",
+    )
+    parser.add_argument(
+        "--copy-workers",
+        type=int,
+        default=1,
+        help="number of threads copying static assets (0 = thread pool default)",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="publish assets as name.<hash>.ext and rewrite references to them",
+    )
+    parser.add_argument(
+        "--block-cache",
+        type=int,
+        default=0,
+        help="number of rendered blocks to reuse across pages (0 = disabled)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory for a render cache reused across builds, e.g. ../.cache (disabled if not given)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        help="maximum size of the render cache in MB",
+    )
+    parser.add_argument(
+        "--ast-cache-dir",
+        default=None,
+        help="directory for parsed page trees so template-only changes skip markdown parsing (disabled if not given)",
+    )
+    parser.add_argument(
+        "--ast-cache-size",
+        type=int,
+        default=256,
+        help="maximum size of the AST cache in MB",
+    )
+    parser.add_argument(
+        "--site-url",
+        default=None,
+        help=f"absolute site URL, e.g. https://example.com; writes {SITEMAP_FILENAME} (disabled if not given)",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write .gz siblings of HTML, CSS, SVG and JSON outputs",
+    )
+    parser.add_argument(
+        "--gzip-workers",
+        type=int,
+        default=0,
+        help="number of threads compressing outputs (0 = thread pool default)",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help=f"swap the output directory with the previous build ({PREVIOUS_SUFFIX}) and exit",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after building, poll the sources and rebuild only what changed",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        help="seconds between polls in --watch mode",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"write phase and per-page timings to {PROFILE_FILENAME} in the build directory",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="number of slowest pages to include in the profile report",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help=f"capture cProfile stats of the main process to {CPROFILE_FILENAME}",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="include tracemalloc peak and top allocation sites in the profile report",
+    )
+    return parser.parse_args(argv)
 
-    print("Copying static files to docs directory...")
-    copy_files_recursive(dir_path_static, dir_path_public)
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.rollback:
+        rollback(args.output)
+        print(f"Restored the previous build into {args.output}")
+        return
+
+    profile = BuildProfile()
+    profiler = cProfile.Profile() if args.cprofile else None
+    if args.tracemalloc:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+
+    block_cache = BlockCache(args.block_cache) if args.block_cache > 0 else None
+    render_cache = None
+    if args.cache_dir is not None:
+        render_cache = RenderCache.open(args.cache_dir, args.cache_size * 1024 * 1024)
+    ast_cache = None
+    if args.ast_cache_dir is not None:
+        ast_cache = AstCache.open(args.ast_cache_dir, args.ast_cache_size * 1024 * 1024)
+    context = BuildContext(
+        args.template, args.basepath, profile=profile if args.profile else None, block_cache=block_cache,
+        render_cache=render_cache, ast_cache=ast_cache,
+    )
+    errors = build(args, profile, context)
+
+    if profiler is not None:
+        profiler.disable()
+        cprofile_path = os.path.join(args.output, CPROFILE_FILENAME)
+        if os.path.exists(cprofile_path):
+            os.remove(cprofile_path)
+        profiler.dump_stats(cprofile_path)
+    if args.tracemalloc:
+        profile.extra["tracemalloc"] = tracemalloc_summary(args.profile_top)
+        tracemalloc.stop()
+    if args.profile or args.tracemalloc:
+        profile.save(os.path.join(args.output, PROFILE_FILENAME), args.profile_top)
+
+    if errors:
+        print(f"{len(errors)} page(s) failed to generate")
+    if args.watch:
+        watcher = SiteWatcher(
+            args.content, args.template, args.static, args.output, args.basepath, args.assets,
+            gzip=args.gzip, fingerprint=args.fingerprint, block_cache=block_cache, render_cache=render_cache,
+            ast_cache=ast_cache,
+        )
+        if errors:
+            watcher.invalidate()
+        watcher.run(args.watch_interval)
+    elif errors:
+        sys.exit(1)
+
+
+def build(args, profile, context):
+    incremental = os.path.exists(os.path.join(args.output, MANIFEST_FILENAME))
+    with profile.phase("stage"):
+        if not incremental and os.path.exists(args.output):
+            print("No build manifest found, rebuilding from scratch...")
+        staging = prepare_staging(args.output, seed=incremental)
+
+    try:
+        errors = build_staging(args, profile, staging, context)
+    except BaseException:
+        print("Build failed, keeping the current output")
+        discard_staging(args.output)
+        raise
+    if errors:
+        print("Build failed, keeping the current output")
+        discard_staging(args.output)
+        return errors
+
+    print(f"Publishing to {args.output}...")
+    with profile.phase("swap"):
+        swap_into_place(args.output)
+    return errors
+
+
+def build_staging(args, profile, staging, context):
+    context.manifest = manifest = Manifest.load(staging)
+
+    context.asset_urls = asset_urls = {} if args.fingerprint else None
+    print("Copying static files to staging directory...")
+    with profile.phase("static copy"):
+        stats = copy_files_recursive(
+            args.static, staging, manifest, mode=args.assets, workers=args.copy_workers, asset_urls=asset_urls,
+            dir_path_public=args.output,
+        )
+        save_asset_urls(staging, asset_urls)
+    print(f"Static files: {stats}")
+    profile.extra["static"] = stats.to_dict()
+
+    context.sitemap = sitemap = Sitemap(staging, args.site_url, args.basepath) if args.site_url else None
     print("Generating content...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_public, basepath)
+    errors = []
+    with profile.phase("generate"):
+        if args.jobs == 1:
+            generate_pages_recursive(args.content, staging, context)
+        else:
+            errors = generate_pages_parallel(args.content, staging, context, args.jobs if args.jobs > 0 else None)
+    block_cache, render_cache, ast_cache = context.caches
+    if block_cache is not None:
+        print(f"Block cache: {block_cache}")
+        profile.extra["block_cache"] = block_cache.to_dict()
+    if render_cache is not None:
+        evicted = render_cache.evict()
+        print(f"Render cache: {render_cache}, {evicted} evicted")
+        profile.extra["render_cache"] = render_cache.to_dict()
+    if ast_cache is not None:
+        evicted = ast_cache.evict()
+        print(f"AST cache: {ast_cache}, {evicted} evicted")
+        profile.extra["ast_cache"] = ast_cache.to_dict()
+    if errors:
+        return errors
+
+    if sitemap is not None:
+        with profile.phase("sitemap"):
+            written = sitemap.write(manifest)
+        print(f"Sitemap: {len(sitemap.entries)} URLs in {len(written)} file(s)")
+        profile.extra["sitemap"] = {"urls": len(sitemap.entries), "files": len(written)}
+
+    if args.gzip:
+        print("Compressing outputs...")
+        with profile.phase("compress"):
+            compress_stats = compress_outputs(manifest, workers=args.gzip_workers)
+        print(f"Compressed files: {compress_stats}")
+        profile.extra["compress"] = compress_stats.to_dict()
+
+    with profile.phase("prune"):
+        for path in manifest.prune():
+            print(f" - {path}")
+        manifest.save()
+    return errors
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
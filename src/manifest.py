@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+
+from fsutil import atomic_open
+from markdown_blocks import RENDERER_VERSION
+
+
+MANIFEST_FILENAME = ".manifest.json"
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, root, entries=None, refs=None):
+        self.root = root
+        self.entries = entries if entries is not None else {}
+        self.refs = refs if refs is not None else {}
+        self.seen = {}
+        self.seen_refs = {}
+        self.file_hashes = {}
+
+    @classmethod
+    def load(cls, root):
+        path = os.path.join(root, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            return cls(root)
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(root, data.get("files", {}), data.get("refs", {}))
+
+    def hash_file(self, path):
+        if path not in self.file_hashes:
+            self.file_hashes[path] = hash_file(path)
+        return self.file_hashes[path]
+
+    def page_digest(self, from_path, template_path, basepath, asset_urls=None, refs=()):
+        parts = [str(RENDERER_VERSION), self.hash_file(from_path), self.hash_file(template_path), basepath]
+        if asset_urls is not None:
+            parts.append("fingerprint")
+            parts.extend(f"{url}={asset_urls.get(url, url)}" for url in refs)
+        return hash_bytes("\0".join(parts).encode("utf-8"))
+
+    def key(self, dest_path):
+        return os.path.relpath(dest_path, self.root).replace(os.sep, "/")
+
+    def previous(self, dest_path):
+        return self.entries.get(self.key(dest_path))
+
+    def previous_refs(self, dest_path):
+        return self.refs.get(self.key(dest_path), [])
+
+    def pages_referencing(self, urls):
+        return [key for key, refs in self.seen_refs.items() if not urls.isdisjoint(refs)]
+
+    def is_fresh(self, dest_path, digest):
+        key = self.key(dest_path)
+        return self.entries.get(key) == digest and os.path.exists(dest_path)
+
+    def record(self, dest_path, digest, refs=()):
+        key = self.key(dest_path)
+        self.seen[key] = digest
+        if refs:
+            self.seen_refs[key] = list(refs)
+        else:
+            self.seen_refs.pop(key, None)
+
+    def forget(self, dest_path):
+        key = self.key(dest_path)
+        self.seen.pop(key, None)
+        self.seen_refs.pop(key, None)
+
+    def resume(self):
+        self.seen = dict(self.entries)
+        self.seen_refs = dict(self.refs)
+
+    def prune(self):
+        removed = []
+        for key in sorted(self.entries):
+            if key in self.seen:
+                continue
+            path = os.path.join(self.root, *key.split("/"))
+            if os.path.isfile(path):
+                os.remove(path)
+                removed.append(path)
+                remove_empty_dirs(os.path.dirname(path), self.root)
+        return removed
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_FILENAME)
+        with atomic_open(path) as f:
+            json.dump({"files": self.seen, "refs": self.seen_refs}, f, indent=2, sort_keys=True)
+        self.entries = dict(self.seen)
+        self.refs = dict(self.seen_refs)
+
+
+def remove_empty_dirs(dir_path, root):
+    root = os.path.abspath(root)
+    dir_path = os.path.abspath(dir_path)
+    while dir_path != root and dir_path.startswith(root + os.sep):
+        if os.listdir(dir_path):
+            return
+        os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
@@ -1,3 +1,5 @@
+import hashlib
+from collections import OrderedDict
 from enum import Enum
 
 from htmlnode import ParentNode
@@ -5,6 +7,9 @@ from inline_markdown import text_to_textnodes
 from textnode import text_node_to_html_node, TextNode, TextType
 
 
+RENDERER_VERSION = 2
+
+
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -14,6 +19,9 @@ class BlockType(Enum):
     ULIST = "unordered_list"
 
 
+LINE_PREFIX_BLOCK_TYPES = (BlockType.QUOTE, BlockType.ULIST, BlockType.OLIST)
+
+
 def markdown_to_blocks(markdown):
     blocks = markdown.split("\n\n")
     filtered_blocks = []
@@ -25,33 +33,104 @@ def markdown_to_blocks(markdown):
     return filtered_blocks
 
 
-def block_to_block_type(block):
-    lines = block.split("\n")
+def iter_markdown_blocks(lines):
+    for _, block_lines in iter_block_lines(lines):
+        yield "\n".join(block_lines)
 
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
+
+def iter_block_lines(lines):
+    block_lines = []
+    blank = []
+    leading = ""
+    block_type = BlockType.PARAGRAPH
+    for line in lines:
+        if line == "\n" and (block_lines or leading):
+            if block_lines or leading != "\n":
+                yield finish_block(block_type, block_lines)
+            block_lines = []
+            blank = []
+            leading = ""
+            block_type = BlockType.PARAGRAPH
+            continue
+        stripped = line.rstrip("\n")
+        if stripped == "" or stripped.isspace():
+            if block_lines:
+                blank.append(stripped)
+            else:
+                leading += line
+            continue
+        if not block_lines:
+            stripped = stripped.lstrip()
+            block_type = first_line_block_type(stripped)
+            block_lines.append(stripped)
+            continue
+        if blank:
+            for blank_line in blank:
+                if not continues_block(block_type, blank_line, len(block_lines) + 1):
+                    block_type = BlockType.PARAGRAPH
+                block_lines.append(blank_line)
+            blank = []
+        if block_type in LINE_PREFIX_BLOCK_TYPES and not continues_block(block_type, stripped, len(block_lines) + 1):
+            block_type = BlockType.PARAGRAPH
+        block_lines.append(stripped)
+    if block_lines or leading:
+        yield finish_block(block_type, block_lines)
+
+
+def finish_block(block_type, lines):
+    if lines:
+        last = lines[-1].rstrip()
+        if len(last) != len(lines[-1]):
+            lines[-1] = last
+            if len(lines) == 1:
+                block_type = first_line_block_type(last)
+            elif not continues_block(block_type, last, len(lines)):
+                block_type = BlockType.PARAGRAPH
+    return closed_block_type(block_type, lines), lines
+
+
+def closed_block_type(block_type, lines):
+    if block_type == BlockType.CODE and (len(lines) < 2 or not lines[-1].startswith("```")):
+        return BlockType.PARAGRAPH
+    return block_type
+
+
+def first_line_block_type(line):
+    if line.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
         return BlockType.HEADING
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
+    if line.startswith("```"):
         return BlockType.CODE
-    if block.startswith(">"):
-        for line in lines:
-            if not line.startswith(">"):
-                return BlockType.PARAGRAPH
+    if line.startswith(">"):
         return BlockType.QUOTE
-    if block.startswith("- "):
-        for line in lines:
-            if not line.startswith("- "):
-                return BlockType.PARAGRAPH
+    if line.startswith("- "):
         return BlockType.ULIST
-    if block.startswith("1. "):
-        i = 1
-        for line in lines:
-            if not line.startswith(f"{i}. "):
-                return BlockType.PARAGRAPH
-            i += 1
+    if line.startswith("1. "):
         return BlockType.OLIST
     return BlockType.PARAGRAPH
 
 
+def continues_block(block_type, line, number):
+    if block_type == BlockType.QUOTE:
+        return line.startswith(">")
+    if block_type == BlockType.ULIST:
+        return line.startswith("- ")
+    if block_type == BlockType.OLIST:
+        return line.startswith(f"{number}. ")
+    return True
+
+
+def block_to_block_type(block):
+    return classify_lines(block.split("\n"))
+
+
+def classify_lines(lines):
+    block_type = first_line_block_type(lines[0])
+    for number, line in enumerate(lines[1:], 2):
+        if not continues_block(block_type, line, number):
+            return BlockType.PARAGRAPH
+    return closed_block_type(block_type, lines)
+
+
 def markdown_to_html_node(markdown):
     blocks = markdown_to_blocks(markdown)
     children = []
@@ -61,20 +140,72 @@ def markdown_to_html_node(markdown):
     return ParentNode("div", children, None)
 
 
+def iter_block_nodes(lines):
+    for block_type, block_lines in iter_block_lines(lines):
+        yield block_lines_to_html_node(block_type, block_lines)
+
+
+def iter_markdown_html(lines, block_cache=None):
+    yield "<div>"
+    if block_cache is None:
+        for node in iter_block_nodes(lines):
+            yield from node.iter_html()
+    else:
+        for block_type, block_lines in iter_block_lines(lines):
+            yield block_cache.render("\n".join(block_lines), block_type, block_lines)
+    yield "</div>"
+
+
+class BlockCache:
+    def __init__(self, max_blocks=4096):
+        self.max_blocks = max_blocks
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, block, block_type=None, lines=None):
+        digest = hashlib.blake2b(block.encode("utf-8"), digest_size=16).digest()
+        key = (digest, RENDERER_VERSION)
+        html = self.blocks.get(key)
+        if html is not None:
+            self.blocks.move_to_end(key)
+            self.hits += 1
+            return html
+        self.misses += 1
+        if lines is None:
+            lines = block.split("\n")
+            block_type = classify_lines(lines)
+        html = block_lines_to_html_node(block_type, lines).to_html()
+        self.blocks[key] = html
+        if len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        return html
+
+    def to_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "blocks": len(self.blocks)}
+
+    def __repr__(self):
+        return f"{self.hits} hits, {self.misses} misses"
+
+
 def block_to_html_node(block):
-    block_type = block_to_block_type(block)
+    lines = block.split("\n")
+    return block_lines_to_html_node(classify_lines(lines), lines)
+
+
+def block_lines_to_html_node(block_type, lines):
     if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
+        return paragraph_to_html_node(lines)
     if block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
+        return heading_to_html_node(lines)
     if block_type == BlockType.CODE:
-        return code_to_html_node(block)
+        return code_to_html_node(lines)
     if block_type == BlockType.OLIST:
-        return olist_to_html_node(block)
+        return olist_to_html_node(lines)
     if block_type == BlockType.ULIST:
-        return ulist_to_html_node(block)
+        return ulist_to_html_node(lines)
     if block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
+        return quote_to_html_node(lines)
     raise ValueError("invalid block type")
 
 
@@ -87,14 +218,14 @@ def text_to_children(text):
     return children
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def paragraph_to_html_node(lines):
     paragraph = " ".join(lines)
     children = text_to_children(paragraph)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(lines):
+    block = "\n".join(lines)
     level = 0
     for char in block:
         if char == "#":
@@ -108,7 +239,8 @@ def heading_to_html_node(block):
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
+def code_to_html_node(lines):
+    block = "\n".join(lines)
     if not block.startswith("```") or not block.endswith("```"):
         raise ValueError("invalid code block")
     text = block[4:-3]
@@ -118,28 +250,25 @@ def code_to_html_node(block):
     return ParentNode("pre", [code])
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(lines):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[3:]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
     return ParentNode("ol", html_items)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(lines):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[2:]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
     return ParentNode("ul", html_items)
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(lines):
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
@@ -147,4 +276,4 @@ def quote_to_html_node(block):
         new_lines.append(line.lstrip(">").strip())
     content = " ".join(new_lines)
     children = text_to_children(content)
-    return ParentNode("blockquote", children)
\ No newline at end of file
+    return ParentNode("blockquote", children)
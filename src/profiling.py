@@ -0,0 +1,88 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from fsutil import atomic_open
+
+
+PROFILE_FILENAME = ".build-profile.json"
+CPROFILE_FILENAME = ".build-profile.prof"
+
+
+class BuildProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.pages = {}
+        self.extra = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def record_page(self, path, stages):
+        self.pages[str(path)] = stages
+
+    def report(self, top=10):
+        stage_totals = {}
+        for stages in self.pages.values():
+            for stage, elapsed in stages.items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + elapsed
+        slowest = sorted(
+            self.pages.items(), key=lambda item: sum(item[1].values()), reverse=True
+        )
+        report = {
+            "total": time.perf_counter() - self.started,
+            "phases": self.phases,
+            "pages": {"count": len(self.pages), "stages": stage_totals},
+            "slowest_pages": [
+                {"path": path, "total": sum(stages.values()), "stages": stages}
+                for path, stages in slowest[:top]
+            ],
+        }
+        report.update(self.extra)
+        return report
+
+    def save(self, path, top=10):
+        with atomic_open(path) as f:
+            json.dump(self.report(top), f, indent=2)
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = now - self.last
+        self.last = now
+
+
+class NullTimer:
+    stages = None
+
+    def lap(self, stage):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+def tracemalloc_summary(top=10):
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "current": current,
+        "peak": peak,
+        "top": [
+            {"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+    }
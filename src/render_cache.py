@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import time
+
+from manifest import hash_bytes
+from markdown_blocks import RENDERER_VERSION
+
+
+RENDER_CACHE_FILENAME = "render-cache.sqlite3"
+
+
+class RenderCache:
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, title TEXT NOT NULL, html TEXT NOT NULL, "
+            "size INTEGER NOT NULL, used REAL NOT NULL)"
+        )
+
+    @classmethod
+    def open(cls, cache_dir, max_bytes=256 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        return cls(os.path.join(cache_dir, RENDER_CACHE_FILENAME), max_bytes)
+
+    def key(self, markdown, basepath):
+        return hash_bytes("\0".join([str(RENDERER_VERSION), basepath, markdown]).encode("utf-8"))
+
+    def get(self, key):
+        row = self.connection.execute("SELECT title, html FROM pages WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE pages SET used = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def put(self, key, title, html):
+        size = len(title.encode("utf-8")) + len(html.encode("utf-8"))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages (key, title, html, size, used) VALUES (?, ?, ?, ?, ?)",
+            (key, title, html, size, time.time()),
+        )
+
+    def total_bytes(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def evict(self):
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+        stale = []
+        for key, size in self.connection.execute("SELECT key, size FROM pages ORDER BY used"):
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+        self.connection.executemany("DELETE FROM pages WHERE key = ?", stale)
+        return len(stale)
+
+    def close(self):
+        self.connection.close()
+
+    def to_dict(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __repr__(self):
+        return f"{self.hits} hits, {self.misses} misses"
@@ -0,0 +1,102 @@
+import os
+import time
+from itertools import islice
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from fsutil import atomic_open
+from manifest import hash_file
+
+
+SITEMAP_FILENAME = "sitemap.xml"
+SITEMAP_SHARD_FORMAT = "sitemap-{}.xml"
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_HEADER = XML_DECLARATION + f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'.encode("utf-8")
+URLSET_FOOTER = b"</urlset>\n"
+INDEX_HEADER = XML_DECLARATION + f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'.encode("utf-8")
+INDEX_FOOTER = b"</sitemapindex>\n"
+
+
+class Sitemap:
+    def __init__(self, root, site_url, basepath="/"):
+        self.root = root
+        self.base_url = site_url.rstrip("/") + basepath
+        self.entries = []
+
+    def add(self, dest_path, from_path):
+        relative = os.path.relpath(dest_path, self.root).replace(os.sep, "/")
+        self.entries.append((page_url(relative), os.stat(from_path).st_mtime))
+
+    def url(self, relative):
+        return self.base_url + quote(relative)
+
+    def write(self, manifest=None, max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES):
+        entries = sorted((self.url(relative), mtime) for relative, mtime in self.entries)
+        shards = shard_entries(entries, max_urls, max_bytes)
+        if len(shards) == 1:
+            paths = [os.path.join(self.root, SITEMAP_FILENAME)]
+        else:
+            paths = [os.path.join(self.root, SITEMAP_SHARD_FORMAT.format(n)) for n in range(1, len(shards) + 1)]
+        written = []
+        index = []
+        for path, (start, end) in zip(paths, shards):
+            lastmod = 0
+            with atomic_open(path, "wb") as f:
+                f.write(URLSET_HEADER)
+                for loc, mtime in islice(entries, start, end):
+                    f.write(url_element(loc, mtime))
+                    lastmod = max(lastmod, mtime)
+                f.write(URLSET_FOOTER)
+            written.append(path)
+            index.append((self.url(os.path.basename(path)), lastmod))
+        if len(paths) > 1:
+            path = os.path.join(self.root, SITEMAP_FILENAME)
+            with atomic_open(path, "wb") as f:
+                f.write(INDEX_HEADER)
+                for loc, mtime in index:
+                    f.write(sitemap_element(loc, mtime))
+                f.write(INDEX_FOOTER)
+            written.append(path)
+        if manifest is not None:
+            for path in written:
+                manifest.record(path, hash_file(path))
+        return written
+
+
+def page_url(relative):
+    if relative == "index.html":
+        return ""
+    if relative.endswith("/index.html"):
+        return relative[: -len("index.html")]
+    return relative
+
+
+def format_lastmod(mtime):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime))
+
+
+def url_element(loc, mtime):
+    return f"<url><loc>{escape(loc)}</loc><lastmod>{format_lastmod(mtime)}</lastmod></url>\n".encode("utf-8")
+
+
+def sitemap_element(loc, mtime):
+    return f"<sitemap><loc>{escape(loc)}</loc><lastmod>{format_lastmod(mtime)}</lastmod></sitemap>\n".encode("utf-8")
+
+
+def shard_entries(entries, max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES):
+    shards = []
+    start = 0
+    size = len(URLSET_HEADER) + len(URLSET_FOOTER)
+    for i, (loc, mtime) in enumerate(entries):
+        length = len(url_element(loc, mtime))
+        if i > start and (i - start == max_urls or size + length > max_bytes):
+            shards.append((start, i))
+            start = i
+            size = len(URLSET_HEADER) + len(URLSET_FOOTER)
+        size += length
+    shards.append((start, len(entries)))
+    return shards
@@ -0,0 +1,251 @@
+import argparse
+import mimetypes
+import os
+import posixpath
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+
+from fingerprint import is_fingerprinted
+
+
+dir_path_public = "../docs"
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ENCODING_TYPES = {"gzip": "application/gzip", "bzip2": "application/x-bzip2", "xz": "application/x-xz"}
+
+
+class FileInfo:
+    def __init__(self, path, stat, encoding=None):
+        self.path = path
+        source_path = path[:-3] if encoding == "gzip" else path
+        self.content_type = guess_type(source_path)
+        self.immutable = is_fingerprinted(source_path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        suffix = "-gz" if encoding == "gzip" else ""
+        self.etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{suffix}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.encoding = encoding
+
+    def matches(self, stat):
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+class FileCache:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, url_path):
+        path = posixpath.normpath(unquote(url_path))
+        parts = [part for part in path.split("/") if part and part != "."]
+        if any(part.startswith(".") for part in parts):
+            return None
+        return os.path.join(self.root, *parts)
+
+    def lookup(self, path, encoding=None):
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        key = (path, encoding)
+        with self.lock:
+            info = self.entries.get(key)
+            if info is None or not info.matches(stat):
+                info = FileInfo(path, stat, encoding)
+                self.entries[key] = info
+        return info
+
+
+class StaticRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "StaticServer/1.0"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.serve(head=False)
+
+    def do_HEAD(self):
+        self.serve(head=True)
+
+    def serve(self, head):
+        cache = self.server.cache
+        url_path = urlsplit(self.path).path
+        path = cache.resolve(url_path)
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        if os.path.isdir(path):
+            if not url_path.endswith("/"):
+                self.redirect(url_path + "/")
+                return
+            path = os.path.join(path, "index.html")
+
+        info = cache.lookup(path)
+        if info is None or os.path.isdir(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        content_type = info.content_type
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        if compressible and accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            gz_info = cache.lookup(path + ".gz", "gzip")
+            if gz_info is not None and gz_info.mtime_ns >= info.mtime_ns:
+                info = gz_info
+
+        if self.not_modified(info):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_file_headers(info, content_type, compressible)
+            self.end_headers()
+            return
+
+        start, end = 0, info.size - 1
+        status = HTTPStatus.OK
+        byte_range = self.requested_range(info)
+        if byte_range == "invalid":
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{info.size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if byte_range is not None:
+            start, end = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_file_headers(info, content_type, compressible)
+        self.send_header("Content-Length", str(length))
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{info.size}")
+        self.end_headers()
+        if head or length <= 0:
+            return
+        with open(info.path, "rb") as f:
+            self.connection.sendfile(f, start, length)
+
+    def send_file_headers(self, info, content_type, compressible):
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", info.etag)
+        self.send_header("Last-Modified", info.last_modified)
+        if info.immutable:
+            self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        else:
+            self.send_header("Cache-Control", self.server.cache_control)
+        if info.encoding is None:
+            self.send_header("Accept-Ranges", "bytes")
+        else:
+            self.send_header("Content-Encoding", info.encoding)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def not_modified(self, info):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or info.etag in tags or f"W/{info.etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return info.mtime_ns // 1_000_000_000 <= since
+        return False
+
+    def requested_range(self, info):
+        header = self.headers.get("Range")
+        if header is None or info.encoding is not None:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range.strip() != info.etag:
+            return None
+        return parse_range(header, info.size)
+
+    def redirect(self, location):
+        self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+        self.send_header("Location", quote(location))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def parse_range(header, size):
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                return "invalid"
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return "invalid"
+    return start, min(end, size - 1)
+
+
+def accepts_gzip(accept_encoding):
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def guess_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding is not None:
+        return ENCODING_TYPES.get(encoding, "application/octet-stream")
+    if content_type is None:
+        return "application/octet-stream"
+    if content_type.startswith("text/"):
+        return content_type + "; charset=utf-8"
+    return content_type
+
+
+def make_server(root, bind="127.0.0.1", port=8888, cache_control="public, max-age=0, must-revalidate", quiet=False):
+    server = ThreadingHTTPServer((bind, port), StaticRequestHandler)
+    server.daemon_threads = True
+    server.cache = FileCache(root)
+    server.cache_control = cache_control
+    server.quiet = quiet
+    return server
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Serve the built site.")
+    parser.add_argument("--directory", default=dir_path_public, help="directory to serve")
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--quiet", action="store_true", help="don't log requests")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = make_server(args.directory, args.bind, args.port, quiet=args.quiet)
+    print(f"Serving {args.directory} on http://{args.bind}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import re
+
+from fingerprint import can_fingerprint
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+URL_PATTERN = re.compile(r'(href|src)="/')
+ASSET_URL_PATTERN = re.compile(r'(href|src)="(/[^"]*)"')
+
+_template_cache = {}
+
+
+class Template:
+    def __init__(self, segments, basepath="/", asset_urls=None, refs=()):
+        self.segments = segments
+        self.basepath = basepath
+        self.asset_urls = asset_urls
+        self.resolved_refs = {url: resolve_asset_url(url, asset_urls) for url in refs}
+
+    def is_current(self, asset_urls):
+        if asset_urls is not self.asset_urls:
+            return False
+        return all(resolve_asset_url(url, asset_urls) == resolved for url, resolved in self.resolved_refs.items())
+
+    def render(self, refs=None, **values):
+        if refs is not None:
+            refs.update(self.resolved_refs)
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, Slot):
+                parts.append(rewrite_urls(values[segment.name], self.basepath, self.asset_urls, refs))
+            else:
+                parts.append(segment)
+        return "".join(parts)
+
+    def write(self, fp, refs=None, **values):
+        if refs is not None:
+            refs.update(self.resolved_refs)
+        for segment in self.segments:
+            if not isinstance(segment, Slot):
+                fp.write(segment)
+                continue
+            value = values[segment.name]
+            if isinstance(value, str):
+                value = [value]
+            for chunk in value:
+                fp.write(rewrite_urls(chunk, self.basepath, self.asset_urls, refs))
+
+    def __repr__(self):
+        return f"Template({self.segments}, {self.basepath})"
+
+
+class Slot:
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, Slot) and self.name == other.name
+
+    def __repr__(self):
+        return f"Slot({self.name})"
+
+
+def compile_template(template, basepath="/", asset_urls=None):
+    segments = []
+    refs = set()
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(template):
+        if match.start() > position:
+            segments.append(rewrite_urls(template[position : match.start()], basepath, asset_urls, refs))
+        segments.append(Slot(match.group(1)))
+        position = match.end()
+    if position < len(template):
+        segments.append(rewrite_urls(template[position:], basepath, asset_urls, refs))
+    return Template(segments, basepath, asset_urls, refs)
+
+
+def load_template(template_path, basepath="/", asset_urls=None):
+    mtime = os.stat(template_path).st_mtime_ns
+    key = (template_path, basepath)
+    cached = _template_cache.get(key)
+    if cached is not None and cached[0] == mtime and cached[1].is_current(asset_urls):
+        return cached[1]
+    with open(template_path, "r") as f:
+        template = compile_template(f.read(), basepath, asset_urls)
+    _template_cache[key] = (mtime, template)
+    return template
+
+
+def rewrite_urls(text, basepath, asset_urls=None, refs=None):
+    if asset_urls or refs is not None:
+        return ASSET_URL_PATTERN.sub(lambda match: rewrite_url(match, basepath, asset_urls, refs), text)
+    if basepath == "/":
+        return text
+    return URL_PATTERN.sub(lambda match: f'{match.group(1)}="{basepath}', text)
+
+
+def rewrite_url(match, basepath, asset_urls, refs):
+    url = match.group(2)
+    if refs is not None and can_fingerprint(url):
+        refs.add(url)
+    return f'{match.group(1)}="{basepath}{resolve_asset_url(url, asset_urls)[1:]}"'
+
+
+def resolve_asset_url(url, asset_urls):
+    if not asset_urls:
+        return url
+    return asset_urls.get(url, url)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import gencontent
+from ast_cache import AstCache
+from gencontent import BuildContext, generate_pages_recursive
+from markdown_blocks import markdown_to_html_node
+from testutil import quiet, read, write
+
+
+class TestAstCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AstCache.open(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_and_put(self):
+        md = "# Home\n\nSome **bold** [link](/blog)"
+        key = self.cache.key(md)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, markdown_to_html_node(md))
+        self.assertEqual(self.cache.get(key).to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = self.cache.key("# Home")
+        write(self.cache.path(key), "not marshal data")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_evict_least_recently_used(self):
+        keys = [self.cache.key(f"# Page {i}") for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, markdown_to_html_node(f"# Page {i}"))
+            os.utime(self.cache.path(key), (i, i))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.cache.max_bytes = self.cache.total_bytes() - 1
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertEqual([os.path.exists(self.cache.path(key)) for key in keys], [True, False, True])
+        self.assertEqual(self.cache.evict(), 0)
+
+
+class TestTemplateOnlyRebuild(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        self.public = os.path.join(root, "docs")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nSome **bold** text")
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n> quoted")
+        self.cache = AstCache.open(os.path.join(root, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_template_change_skips_parsing(self):
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        generate_pages_recursive(self.content, self.public, BuildContext(self.template, ast_cache=self.cache))
+        write(self.template, '<h2>{{ Title }}</h2><a href="/">{{ Content }}</a>')
+        with mock.patch.object(gencontent, "markdown_to_html_node", side_effect=AssertionError("parsed")):
+            generate_pages_recursive(self.content, self.public, BuildContext(self.template, "/Static/", ast_cache=self.cache))
+        self.assertEqual(
+            read(os.path.join(self.public, "index.html")),
+            '<h2>Home</h2><a href="/Static/"><div><h1>Home</h1><p>Some <b>bold</b> text</p></div></a>',
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import INCOMPRESSIBLE_PREFIX, compress_outputs
+from manifest import Manifest
+from testutil import write
+
+
+class TestCompressOutputs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.public = self.tmp.name
+        self.outputs = {}
+        self.page = "<p>" + "hello world " * 50 + "</p>"
+        self.record("index.html", self.page, "page-v1")
+        self.record("index.css", "p{}", "css-v1")
+        self.record("images/tom.png", "not text " * 50, "png-v1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, key, text, digest):
+        write(os.path.join(self.public, *key.split("/")), text)
+        self.outputs[key] = digest
+
+    def build(self, workers=0):
+        manifest = Manifest.load(self.public)
+        for key, digest in self.outputs.items():
+            manifest.seen[key] = digest
+        stats = compress_outputs(manifest, workers=workers)
+        manifest.prune()
+        manifest.save()
+        return stats, manifest
+
+    def test_writes_gzip_siblings(self):
+        stats, manifest = self.build()
+        with open(os.path.join(self.public, "index.html.gz"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()).decode(), self.page)
+        self.assertEqual((stats.compressed, stats.incompressible), (1, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images", "tom.png.gz")))
+        self.assertEqual(manifest.entries["index.html.gz"], "page-v1")
+        self.assertEqual(manifest.entries["index.css.gz"], INCOMPRESSIBLE_PREFIX + "css-v1")
+
+    def test_unchanged_sources_skipped(self):
+        self.build()
+        stats, _ = self.build(workers=1)
+        self.assertEqual((stats.compressed, stats.skipped, stats.incompressible), (0, 2, 0))
+
+    def test_changed_source_recompressed(self):
+        self.build()
+        self.page = "<p>" + "changed " * 50 + "</p>"
+        self.record("index.html", self.page, "page-v2")
+        stats, _ = self.build()
+        self.assertEqual((stats.compressed, stats.skipped), (1, 1))
+        with open(os.path.join(self.public, "index.html.gz"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()).decode(), self.page)
+
+    def test_output_is_deterministic(self):
+        self.build()
+        with open(os.path.join(self.public, "index.html.gz"), "rb") as f:
+            first = f.read()
+        os.remove(os.path.join(self.public, "index.html.gz"))
+        self.build()
+        with open(os.path.join(self.public, "index.html.gz"), "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_removed_source_prunes_sibling(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        del self.outputs["index.html"]
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from copystatic import copy_files_recursive, publish_file
+from manifest import Manifest
+from testutil import quiet, write
+
+
+class TestCopyStatic(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "docs")
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.static, "images", "a.png"), "aaaa")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self):
+        manifest = Manifest.load(self.public)
+        stats = copy_files_recursive(self.static, self.public, manifest)
+        removed = manifest.prune()
+        manifest.save()
+        return stats, removed, manifest
+
+    def test_copy_without_manifest(self):
+        stats = copy_files_recursive(self.static, self.public)
+        self.assertEqual(stats.copied, 2)
+        self.assertEqual(stats.copied_bytes, 11)
+        with open(os.path.join(self.public, "images", "a.png")) as f:
+            self.assertEqual(f.read(), "aaaa")
+
+    def test_unchanged_files_skipped_without_hashing(self):
+        self.sync()
+        manifest = Manifest.load(self.public)
+
+        def fail(path):
+            raise AssertionError(f"hashed {path}")
+
+        manifest.hash_file = fail
+        stats = copy_files_recursive(self.static, self.public, manifest)
+        self.assertEqual((stats.copied, stats.skipped, stats.skipped_bytes), (0, 2, 11))
+
+    def test_touched_file_not_copied(self):
+        self.sync()
+        source = os.path.join(self.static, "index.css")
+        os.utime(source, ns=(10**18, 10**18))
+        stats, _, _ = self.sync()
+        self.assertEqual((stats.copied, stats.skipped), (0, 2))
+        dest = os.path.join(self.public, "index.css")
+        self.assertEqual(os.stat(dest).st_mtime_ns, 10**18)
+
+    def test_changed_file_copied(self):
+        self.sync()
+        write(os.path.join(self.static, "images", "a.png"), "bbbb")
+        os.utime(os.path.join(self.static, "images", "a.png"), ns=(10**18, 10**18))
+        stats, _, _ = self.sync()
+        self.assertEqual((stats.copied, stats.copied_bytes, stats.skipped), (1, 4, 1))
+        with open(os.path.join(self.public, "images", "a.png")) as f:
+            self.assertEqual(f.read(), "bbbb")
+
+    def test_stale_file_removed(self):
+        self.sync()
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        _, removed, _ = self.sync()
+        self.assertEqual(removed, [os.path.join(self.public, "images", "a.png")])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+
+    def test_hardlink_publish(self):
+        stats = copy_files_recursive(self.static, self.public, mode="hardlink")
+        self.assertEqual((stats.copied, stats.linked), (2, 2))
+        source = os.stat(os.path.join(self.static, "images", "a.png"))
+        dest = os.stat(os.path.join(self.public, "images", "a.png"))
+        self.assertEqual(source.st_ino, dest.st_ino)
+
+    def test_hardlink_replaced_by_copy(self):
+        source = os.path.join(self.static, "index.css")
+        dest = os.path.join(self.tmp.name, "index.css")
+        publish_file(source, dest, "hardlink")
+        self.assertEqual(publish_file(source, dest, "copy"), "copy")
+        self.assertNotEqual(os.stat(source).st_ino, os.stat(dest).st_ino)
+
+    def test_reflink_publish_falls_back(self):
+        source = os.path.join(self.static, "index.css")
+        dest = os.path.join(self.tmp.name, "index.css")
+        self.assertIn(publish_file(source, dest, "reflink"), ["reflink", "copy"])
+        with open(dest) as f:
+            self.assertEqual(f.read(), "body {}")
+        self.assertEqual(os.stat(source).st_mtime_ns, os.stat(dest).st_mtime_ns)
+
+    def test_thread_pool_copy(self):
+        for i in range(20):
+            write(os.path.join(self.static, "images", f"{i:02}.png"), "x" * i)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            stats, _, manifest = self.sync_with(workers=4)
+        self.assertEqual(stats.copied, 22)
+        self.assertEqual(len(manifest.entries), 22)
+        printed = [line.split(" -> ")[1] for line in out.getvalue().splitlines()]
+        self.assertEqual(printed, sorted(printed))
+        with open(os.path.join(self.public, "images", "07.png")) as f:
+            self.assertEqual(f.read(), "xxxxxxx")
+
+        stats, _, _ = self.sync_with(workers=4)
+        self.assertEqual((stats.copied, stats.skipped), (0, 22))
+
+    def sync_with(self, workers):
+        manifest = Manifest.load(self.public)
+        stats = copy_files_recursive(self.static, self.public, manifest, workers=workers)
+        removed = manifest.prune()
+        manifest.save()
+        return stats, removed, manifest
+
+
+if __name__ == "__main__":
+    unittest.main()
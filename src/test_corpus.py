@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from corpus import CorpusSpec, generate_corpus
+from gencontent import extract_title
+from markdown_blocks import markdown_to_html_node
+
+
+def read_all(paths):
+    contents = []
+    for path in paths:
+        with open(path) as f:
+            contents.append(f.read())
+    return contents
+
+
+class TestCorpus(unittest.TestCase):
+    def test_reproducible(self):
+        spec = CorpusSpec(pages=5, seed=42)
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            a = read_all(generate_corpus(first, spec))
+            b = read_all(generate_corpus(second, spec))
+        self.assertEqual(a, b)
+
+    def test_pages_render(self):
+        spec = CorpusSpec(pages=120, paragraphs=4, link_density=0.3, image_density=0.1)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate_corpus(tmp, spec)
+            self.assertEqual(paths[0], os.path.join(tmp, "index.md"))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "section1", "page119", "index.md")))
+            for markdown in read_all(paths):
+                extract_title(markdown)
+                html = markdown_to_html_node(markdown).to_html()
+                self.assertIn("<ul>", html)
+                self.assertIn("<blockquote>", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
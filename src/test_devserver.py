@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from devserver import DevRequestHandler, PageRenderer, is_excluded, make_server
+from testutil import write
+
+
+class TestPageRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home", 1)
+        write(os.path.join(self.content, "blog", "tom", "index.md"), "# Tom", 1)
+        self.renderer = PageRenderer(self.content, self.template, max_pages=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_source(self):
+        home = os.path.join(self.content, "index.md")
+        tom = os.path.join(self.content, "blog", "tom", "index.md")
+        self.assertEqual(self.renderer.find_source("/"), home)
+        self.assertEqual(self.renderer.find_source("/index.html"), home)
+        self.assertEqual(self.renderer.find_source("/blog/tom"), tom)
+        self.assertEqual(self.renderer.find_source("/blog/tom/"), tom)
+        self.assertEqual(self.renderer.find_source("/blog/tom/index.html"), tom)
+        self.assertIsNone(self.renderer.find_source("/blog"))
+        self.assertIsNone(self.renderer.find_source("/../content"))
+
+    def test_render_cached_until_modified(self):
+        path = os.path.join(self.content, "index.md")
+        first = self.renderer.render(path)
+        self.assertEqual(first, b"<title>Home</title><div><h1>Home</h1></div>")
+        self.assertIs(self.renderer.render(path), first)
+        write(path, "# Home 2", 2)
+        self.assertIn(b"Home 2", self.renderer.render(path))
+        self.assertEqual((self.renderer.hits, self.renderer.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        home = os.path.join(self.content, "index.md")
+        tom = os.path.join(self.content, "blog", "tom", "index.md")
+        self.renderer.render(home)
+        self.renderer.render(tom)
+        self.assertEqual(list(self.renderer.pages), [tom])
+
+    def test_is_excluded(self):
+        self.assertTrue(is_excluded("/src/main.py"))
+        self.assertTrue(is_excluded("/.git/config"))
+        self.assertTrue(is_excluded("/template.html"))
+        self.assertFalse(is_excluded("/images/tom.png"))
+
+
+class TestDevServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        write(os.path.join(root, "template.html"), "{{ Title }}|{{ Content }}")
+        write(os.path.join(root, "content", "index.md"), "# Home")
+        write(os.path.join(root, "index.css"), "body {}")
+        write(os.path.join(root, "src", "secret.py"), "secret")
+        renderer = PageRenderer(
+            os.path.join(root, "content"), os.path.join(root, "template.html")
+        )
+        self.server = make_server(renderer, root, port=0)
+        patcher = mock.patch.object(DevRequestHandler, "log_message")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def get(self, path):
+        with urllib.request.urlopen(self.base + path) as response:
+            return response.status, response.read()
+
+    def test_renders_page(self):
+        self.assertEqual(self.get("/"), (200, b"Home|<div><h1>Home</h1></div>"))
+
+    def test_serves_static(self):
+        self.assertEqual(self.get("/index.css"), (200, b"body {}"))
+
+    def test_hides_sources(self):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.get("/src/secret.py")
+        self.assertEqual(cm.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from copystatic import copy_files_recursive
+from fingerprint import fingerprint_name, is_fingerprinted, load_asset_urls, save_asset_urls
+from manifest import Manifest, hash_bytes
+from testutil import quiet, write
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_fingerprint_name(self):
+        digest = hash_bytes(b"body {}")
+        name = fingerprint_name("docs/index.css", digest)
+        self.assertEqual(name, f"docs/index.{digest[:10]}.css")
+        self.assertTrue(is_fingerprinted(name))
+        self.assertFalse(is_fingerprinted("docs/index.css"))
+        self.assertFalse(is_fingerprinted("docs/jquery.min.js"))
+
+    def test_copy_with_fingerprints(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            static = os.path.join(tmp, "static")
+            public = os.path.join(tmp, "docs")
+            write(os.path.join(static, "index.css"), "body {}")
+            write(os.path.join(static, "images", "a.png"), "aaaa")
+            write(os.path.join(static, "robots.txt"), "")
+            manifest = Manifest.load(public)
+            asset_urls = {}
+            with quiet():
+                copy_files_recursive(static, public, manifest, asset_urls=asset_urls)
+
+            css = f"/index.{hash_bytes(b'body {}')[:10]}.css"
+            png = f"/images/a.{hash_bytes(b'aaaa')[:10]}.png"
+            self.assertEqual(asset_urls, {"/index.css": css, "/images/a.png": png})
+            self.assertTrue(os.path.exists(public + css))
+            self.assertTrue(os.path.exists(public + png))
+            self.assertFalse(os.path.exists(os.path.join(public, "index.css")))
+            self.assertTrue(os.path.exists(os.path.join(public, "robots.txt")))
+            self.assertIn(css[1:], manifest.seen)
+
+            save_asset_urls(public, asset_urls)
+            self.assertEqual(load_asset_urls(public), asset_urls)
+            save_asset_urls(public, None)
+            self.assertEqual(load_asset_urls(public), {})
+
+    def test_unchanged_assets_not_rehashed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            static = os.path.join(tmp, "static")
+            public = os.path.join(tmp, "docs")
+            write(os.path.join(static, "index.css"), "body {}")
+            write(os.path.join(static, "images", "a.png"), "aaaa")
+
+            def counting(manifest):
+                hash_file = manifest.hash_file
+                manifest.hash_file = lambda path: hashed.add(path) or hash_file(path)
+                return manifest
+
+            def sync(manifest):
+                asset_urls = {}
+                with quiet():
+                    stats = copy_files_recursive(static, public, manifest, asset_urls=asset_urls)
+                save_asset_urls(public, asset_urls)
+                manifest.save()
+                return stats, asset_urls
+
+            _, first = sync(Manifest.load(public))
+            hashed = set()
+            stats, second = sync(counting(Manifest.load(public)))
+            self.assertEqual(hashed, set())
+            self.assertEqual((stats.copied, stats.skipped), (0, 2))
+            self.assertEqual(second, first)
+
+            write(os.path.join(static, "images", "a.png"), "bbbb")
+            _, third = sync(counting(Manifest.load(public)))
+            self.assertEqual(hashed, {os.path.join(static, "images", "a.png")})
+            self.assertEqual(third["/images/a.png"], f"/images/a.{hash_bytes(b'bbbb')[:10]}.png")
+            self.assertEqual(third["/index.css"], first["/index.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from frontmatter import iter_metadata, parse_front_matter, read_metadata, split_front_matter
+from gencontent import BuildContext, render_article, render_page
+from profiling import NULL_TIMER, StageTimer
+from testutil import read, write
+
+
+PAGE = "---\ntitle: Glorfindel\ndate: 2024-01-02\ndraft: true\n---\n# Heading\n\nSome **bold** text"
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_split(self):
+        metadata, body = split_front_matter(PAGE)
+        self.assertEqual(metadata, {"title": "Glorfindel", "date": "2024-01-02", "draft": "true"})
+        self.assertEqual(body, "# Heading\n\nSome **bold** text")
+
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Home\n\ntext"), ({}, "# Home\n\ntext"))
+        self.assertEqual(split_front_matter(""), ({}, ""))
+
+    def test_unclosed_header_is_body(self):
+        self.assertEqual(split_front_matter("---\ntitle: x\n# Home"), ({}, "---\ntitle: x\n# Home"))
+
+    def test_values_keep_colons(self):
+        metadata, _ = split_front_matter("---\nurl: https://example.com/a\n\n# comment\n---\n")
+        self.assertEqual(metadata, {"url": "https://example.com/a"})
+
+    def test_invalid_line(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\nnot a pair\n---\n# Home")
+
+    def test_stops_at_end_of_header(self):
+        lines = iter(["---\n", "title: A\n", "---\n", "# Heading\n", "body\n"])
+        metadata, rest = parse_front_matter(lines)
+        self.assertEqual(metadata, {"title": "A"})
+        self.assertEqual(next(rest), "# Heading\n")
+
+
+class TestReadMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_read_metadata_stops_at_first_heading(self):
+        path = os.path.join(self.content, "a.md")
+        write(path, b"# Title\n\n" + b"padding\n" * 8192 + b"\xff\xfe not utf-8\n")
+        self.assertEqual(read_metadata(path), {"title": "Title"})
+        write(path, b"---\ntitle: Front\n---\n" + b"padding\n" * 8192 + b"\xff\xfe not utf-8\n")
+        self.assertEqual(read_metadata(path), {"title": "Front"})
+
+    def test_read_metadata(self):
+        write(os.path.join(self.content, "a.md"), PAGE)
+        write(os.path.join(self.content, "b", "index.md"), "intro\n# Plain page\n\ntext")
+        write(os.path.join(self.content, "c.md"), "---\ndraft: true\n---\nno heading")
+        write(os.path.join(self.content, "notes.txt"), "# Not a page")
+        self.assertEqual(
+            list(iter_metadata(self.content)),
+            [
+                (os.path.join(self.content, "a.md"), {"title": "Glorfindel", "date": "2024-01-02", "draft": "true"}),
+                (os.path.join(self.content, "b", "index.md"), {"title": "Plain page"}),
+                (os.path.join(self.content, "c.md"), {"draft": "true"}),
+            ],
+        )
+
+    def test_render_skips_header(self):
+        source = os.path.join(self.content, "a.md")
+        write(source, PAGE)
+        template = os.path.join(self.tmp.name, "template.html")
+        write(template, "<title>{{ Title }}</title>{{ Content }}")
+        expected = "<title>Glorfindel</title><div><h1>Heading</h1><p>Some <b>bold</b> text</p></div>"
+        context = BuildContext(template)
+        self.assertEqual(render_article(PAGE, context), ("Glorfindel", expected[len("<title>Glorfindel</title>"):]))
+        for timer in [NULL_TIMER, StageTimer()]:
+            dest = os.path.join(self.tmp.name, "out.html")
+            render_page(source, dest, context, timer)
+            self.assertEqual(read(dest), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
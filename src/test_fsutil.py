@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import fsutil
+from fsutil import atomic_open, exchange_paths, link_tree, prepare_staging, rollback, swap_into_place
+from testutil import read, write
+
+
+class TestAtomicOpen(unittest.TestCase):
+    def test_replaces_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            write(path, "old")
+            with atomic_open(path) as f:
+                f.write("new")
+            self.assertEqual(read(path), "new")
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+    def test_failure_keeps_old_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            write(path, "old")
+            with self.assertRaises(ValueError):
+                with atomic_open(path) as f:
+                    f.write("partial")
+                    raise ValueError("boom")
+            self.assertEqual(read(path), "old")
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+    def test_does_not_write_through_hardlink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "a.html")
+            linked = os.path.join(tmp, "b.html")
+            write(source, "old")
+            os.link(source, linked)
+            with atomic_open(linked) as f:
+                f.write("new")
+            self.assertEqual(read(source), "old")
+            self.assertEqual(read(linked), "new")
+
+
+class TestStaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "docs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_link_tree(self):
+        write(os.path.join(self.output, "blog", "index.html"), "blog")
+        dest = os.path.join(self.tmp.name, "copy")
+        link_tree(self.output, dest)
+        self.assertEqual(read(os.path.join(dest, "blog", "index.html")), "blog")
+
+    def test_first_build(self):
+        staging = prepare_staging(self.output)
+        write(os.path.join(staging, "index.html"), "v1")
+        self.assertFalse(os.path.exists(self.output))
+        swap_into_place(self.output)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v1")
+        self.assertFalse(os.path.exists(staging))
+
+    def test_swap_keeps_previous_and_rollback(self):
+        write(os.path.join(self.output, "index.html"), "v1")
+        staging = prepare_staging(self.output)
+        self.assertEqual(read(os.path.join(staging, "index.html")), "v1")
+        with atomic_open(os.path.join(staging, "index.html")) as f:
+            f.write("v2")
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v1")
+
+        swap_into_place(self.output)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v2")
+        previous = self.output + ".previous"
+        self.assertEqual(read(os.path.join(previous, "index.html")), "v1")
+
+        rollback(self.output)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v1")
+        self.assertEqual(read(os.path.join(previous, "index.html")), "v2")
+
+    @unittest.skipIf(fsutil.renameat2 is None, "renameat2 is not available")
+    def test_exchange_paths(self):
+        staging = self.output + ".staging"
+        write(os.path.join(self.output, "index.html"), "v1")
+        write(os.path.join(staging, "index.html"), "v2")
+        exchange_paths(staging, self.output)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v2")
+        self.assertEqual(read(os.path.join(staging, "index.html")), "v1")
+
+    def test_swap_without_exchange(self):
+        write(os.path.join(self.output, "index.html"), "v1")
+        staging = prepare_staging(self.output)
+        with atomic_open(os.path.join(staging, "index.html")) as f:
+            f.write("v2")
+        with mock.patch.object(fsutil, "renameat2", None):
+            swap_into_place(self.output)
+            self.assertEqual(read(os.path.join(self.output, "index.html")), "v2")
+            rollback(self.output)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "v1")
+        self.assertEqual(read(os.path.join(self.output + ".previous", "index.html")), "v2")
+        self.assertFalse(os.path.exists(staging))
+
+    def test_unseeded_staging_is_empty(self):
+        write(os.path.join(self.output, "index.html"), "v1")
+        staging = prepare_staging(self.output, seed=False)
+        self.assertEqual(os.listdir(staging), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
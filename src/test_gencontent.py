@@ -1,6 +1,16 @@
+import os
+import tempfile
 import unittest
 
-from gencontent import extract_title
+from gencontent import (
+    extract_title,
+    extract_title_from_lines,
+    BuildContext,
+    generate_pages_parallel,
+    generate_pages_recursive,
+)
+from markdown_blocks import BlockCache
+from testutil import quiet
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -45,6 +55,73 @@ no title
         except Exception as e:
             pass
 
+    def test_from_lines(self):
+        actual = extract_title_from_lines(["intro\n", "# A title \n", "# Other\n"])
+        self.assertEqual(actual, "A title ")
+
+
+class TestGeneratePagesParallel(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        with open(self.template, "w") as f:
+            f.write('<title>{{ Title }}</title><a href="/">{{ Content }}</a>')
+        for i in range(10):
+            page_dir = os.path.join(self.content, f"page{i}")
+            os.makedirs(page_dir)
+            with open(os.path.join(page_dir, "index.md"), "w") as f:
+                f.write(f"# Page {i}\n\nThis is **page** number {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, root):
+        files = {}
+        for dir_path, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                with open(path) as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        generate_pages_recursive(self.content, serial, BuildContext(self.template, "/Static/"))
+        errors = generate_pages_parallel(self.content, parallel, BuildContext(self.template, "/Static/"), jobs=2)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+
+    def test_block_cache_matches_uncached(self):
+        plain = os.path.join(self.tmp.name, "plain")
+        cached = os.path.join(self.tmp.name, "cached")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        generate_pages_recursive(self.content, plain, BuildContext(self.template, "/Static/"))
+        block_cache = BlockCache()
+        generate_pages_recursive(self.content, cached, BuildContext(self.template, "/Static/", block_cache=block_cache))
+        self.assertEqual(self.read_tree(plain), self.read_tree(cached))
+        self.assertEqual((block_cache.hits, block_cache.misses), (0, 20))
+
+        parallel_cache = BlockCache()
+        errors = generate_pages_parallel(
+            self.content, parallel, BuildContext(self.template, "/Static/", block_cache=parallel_cache), jobs=2
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(self.read_tree(plain), self.read_tree(parallel))
+        self.assertEqual(parallel_cache.hits + parallel_cache.misses, 20)
+
+    def test_errors_reported_per_file(self):
+        bad_path = os.path.join(self.content, "page3", "index.md")
+        with open(bad_path, "w") as f:
+            f.write("no title here")
+        dest = os.path.join(self.tmp.name, "parallel")
+        errors = generate_pages_parallel(self.content, dest, BuildContext(self.template), jobs=2)
+        self.assertEqual([path for path, _ in errors], [bad_path])
+        self.assertEqual(len(self.read_tree(dest)), 9)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,8 @@
+import io
+import marshal
+import sys
 import unittest
-from htmlnode import LeafNode, ParentNode, HTMLNode
+from htmlnode import LeafNode, ParentNode, HTMLNode, node_from_tuple, node_to_tuple
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -108,6 +111,65 @@ class TestHTMLNode(unittest.TestCase):
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
 
+    def test_iter_html(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")]),
+                LeafNode("a", "link", {"href": "/blog"}),
+            ],
+            {"class": "post"},
+        )
+        chunks = list(node.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), node.to_html())
+        self.assertEqual(
+            node.to_html(),
+            '<div class="post"><p><b>Bold</b> text</p><a href="/blog">link</a></div>',
+        )
+
+    def test_write_html(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "item")])])
+        fp = io.StringIO()
+        node.write_html(fp)
+        self.assertEqual(fp.getvalue(), "<ul><li>item</li></ul>")
+
+    def test_iter_html_no_children(self):
+        node = ParentNode("div", None)
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+
+    def test_to_html_deeply_nested(self):
+        depth = sys.getrecursionlimit() * 2
+        node = LeafNode(None, "bottom")
+        for _ in range(depth):
+            node = ParentNode("blockquote", [node, LeafNode("b", "x")])
+        self.assertEqual(
+            node.to_html(),
+            "<blockquote>" * depth + "bottom" + "<b>x</b></blockquote>" * depth,
+        )
+
+    def test_to_html_custom_child(self):
+        class RawNode(HTMLNode):
+            def to_html(self):
+                return "<hr>"
+
+        node = ParentNode("div", [RawNode(), ParentNode("p", [RawNode()])])
+        self.assertEqual(node.to_html(), "<div><hr><p><hr></p></div>")
+
+    def test_tuple_round_trip(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode(None, "text "), LeafNode("a", "link", {"href": "/blog"})]),
+                LeafNode("img", "", {"src": "/a.png", "alt": "a"}),
+            ],
+        )
+        data = node_to_tuple(node)
+        self.assertEqual(marshal.loads(marshal.dumps(data)), data)
+        self.assertEqual(node_from_tuple(data).to_html(), node.to_html())
+        self.assertEqual(node_to_tuple(node_from_tuple(data)), data)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import random
 import unittest
 from inline_markdown import (
     split_nodes_delimiter,
@@ -171,6 +172,27 @@ class TestInlineMarkdown(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_links_after_matching_image(self):
+        node = TextNode("![a](u) and [a](u)", TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("![a](u) and ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "u"),
+            ],
+            split_nodes_link([node]),
+        )
+
+    def test_split_repeated_images(self):
+        node = TextNode("![a](u)![a](u) x", TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.IMAGE, "u"),
+                TextNode("a", TextType.IMAGE, "u"),
+                TextNode(" x", TextType.TEXT),
+            ],
+            split_nodes_image([node]),
+        )
+
     def test_text_to_textnodes(self):
         nodes = text_to_textnodes(
             "This is **text** with an _italic_ word and a `code block` and an ![image](https://i.imgur.com/zjjcJKZ.png) and a [link](https://boot.dev)"
@@ -191,6 +213,56 @@ class TestInlineMarkdown(unittest.TestCase):
             nodes,
         )
 
+    def test_text_to_textnodes_matches_split_pipeline(self):
+        def split_pipeline(text):
+            nodes = [TextNode(text, TextType.TEXT)]
+            nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+            nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+            nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+            nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+            nodes = split_nodes_image(nodes)
+            return split_nodes_link(nodes)
+
+        def outcome(function, text):
+            try:
+                return function(text)
+            except ValueError as e:
+                return str(e).partition(" (")[0]
+
+        rng = random.Random(1234)
+        pieces = ["a", "b ", "*", "**", "_", "`", "!", "[", "]", "(", ")", "![x](y)", "[t](u)"]
+        for _ in range(5000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(
+                outcome(split_pipeline, text), outcome(text_to_textnodes, text), text
+            )
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is **unclosed bold")
+
+    def test_text_to_textnodes_unclosed_reports_offset(self):
+        with self.assertRaisesRegex(ValueError, r"\(\*\* at offset 8\)"):
+            text_to_textnodes("This is **unclosed bold")
+        with self.assertRaisesRegex(ValueError, r"\(` at offset 13\)"):
+            text_to_textnodes("**bold** and `code")
+
+    def test_text_to_textnodes_spans(self):
+        rng = random.Random(4321)
+        pieces = ["a", "b ", "**x**", "_y_", "`z`", "![x](y)", "[t](u)", "[", "](", ")"]
+        for _ in range(2000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            spans = []
+            nodes = text_to_textnodes(text, spans)
+            self.assertEqual(nodes, text_to_textnodes(text))
+            self.assertEqual([node.text for node in nodes], [text[start:end] for start, end in spans], text)
+            self.assertEqual([start for start, _ in spans], sorted(start for start, _ in spans), text)
+
+    def test_text_to_textnodes_span_positions(self):
+        spans = []
+        text_to_textnodes("a **b** [c](d)", spans)
+        self.assertEqual(spans, [(0, 2), (4, 5), (7, 8), (9, 10)])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
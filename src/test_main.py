@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import gencontent
+import main
+from testutil import quiet, read, write
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.output = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.content, "index.md"), "# Home")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, *flags):
+        main.main([
+            "--content", self.content, "--static", self.static, "--template", self.template,
+            "--output", self.output, *flags,
+        ])
+
+    def test_failed_serial_build_discards_staging(self):
+        self.build()
+        write(os.path.join(self.content, "blog", "index.md"), "no title")
+        with self.assertRaises(ValueError):
+            self.build()
+        self.assertFalse(os.path.exists(self.output + ".staging"))
+        self.assertEqual(sorted(os.listdir(self.output)), [".manifest.json", "index.css", "index.html"])
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<title>Home</title><div><h1>Home</h1></div>")
+
+    def test_rebuild_keeps_previous(self):
+        self.build()
+        write(os.path.join(self.content, "index.md"), "# Home v2")
+        self.build()
+        self.assertIn("Home v2", read(os.path.join(self.output, "index.html")))
+        self.assertNotIn("Home v2", read(os.path.join(self.output + ".previous", "index.html")))
+        self.assertFalse(os.path.exists(self.output + ".staging"))
+
+    def test_output_inside_static_root_not_copied(self):
+        self.output = os.path.join(self.static, "site")
+        self.build()
+        write(os.path.join(self.content, "index.md"), "# Home v2")
+        self.build()
+        self.assertEqual(sorted(os.listdir(self.output)), [".manifest.json", "index.css", "index.html"])
+        self.assertEqual(sorted(os.listdir(self.output + ".previous")), [".manifest.json", "index.css", "index.html"])
+
+    def test_template_only_rebuild_reads_ast_cache(self):
+        self.build("--ast-cache-dir", os.path.join(self.tmp.name, "ast"))
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        with mock.patch.object(gencontent, "markdown_to_html_node", side_effect=AssertionError("parsed")):
+            self.build("--ast-cache-dir", os.path.join(self.tmp.name, "ast"))
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<h1>Home</h1><div><h1>Home</h1></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import manifest
+from gencontent import BuildContext, generate_pages_recursive
+from manifest import Manifest
+from testutil import quiet, write
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home")
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, basepath="/", asset_urls=None):
+        manifest = Manifest.load(self.public)
+        context = BuildContext(self.template, basepath, manifest, asset_urls=asset_urls)
+        generate_pages_recursive(self.content, self.public, context)
+        removed = manifest.prune()
+        manifest.save()
+        return removed
+
+    def mtimes(self):
+        return {
+            name: os.stat(os.path.join(self.public, name, "index.html")).st_mtime_ns
+            for name in ["", "blog"]
+        }
+
+    def touch_outputs(self):
+        for name in ["", "blog"]:
+            os.utime(os.path.join(self.public, name, "index.html"), ns=(0, 0))
+
+    def test_unchanged_pages_skipped(self):
+        self.build()
+        self.touch_outputs()
+        self.build()
+        self.assertEqual(self.mtimes(), {"": 0, "blog": 0})
+
+    def test_changed_page_rebuilt(self):
+        self.build()
+        self.touch_outputs()
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog 2")
+        self.build()
+        mtimes = self.mtimes()
+        self.assertEqual(mtimes[""], 0)
+        self.assertNotEqual(mtimes["blog"], 0)
+
+    def test_asset_change_rebuilds_referencing_pages(self):
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n![ring](/images/ring.png)")
+        asset_urls = {"/images/ring.png": "/images/ring.0000000000.png", "/images/tree.png": "/images/tree.0000000000.png"}
+        self.build(asset_urls=asset_urls)
+        self.assertEqual(Manifest.load(self.public).refs, {"blog/index.html": ["/images/ring.png"]})
+        self.touch_outputs()
+        self.build(asset_urls=dict(asset_urls, **{"/images/tree.png": "/images/tree.1111111111.png"}))
+        self.assertEqual(self.mtimes(), {"": 0, "blog": 0})
+        self.build(asset_urls=dict(asset_urls, **{"/images/ring.png": "/images/ring.1111111111.png"}))
+        mtimes = self.mtimes()
+        self.assertEqual(mtimes[""], 0)
+        self.assertNotEqual(mtimes["blog"], 0)
+
+    def test_enabling_fingerprints_rebuilds_all(self):
+        self.build()
+        self.touch_outputs()
+        self.build(asset_urls={})
+        self.assertNotIn(0, self.mtimes().values())
+
+    def test_renderer_version_change_rebuilds_all(self):
+        self.build()
+        self.touch_outputs()
+        with mock.patch.object(manifest, "RENDERER_VERSION", manifest.RENDERER_VERSION + 1):
+            self.build()
+        self.assertNotIn(0, self.mtimes().values())
+
+    def test_basepath_change_rebuilds_all(self):
+        self.build()
+        self.touch_outputs()
+        self.build("/Static/")
+        self.assertNotIn(0, self.mtimes().values())
+
+    def test_deleted_source_pruned(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        removed = self.build()
+        self.assertEqual(len(removed), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
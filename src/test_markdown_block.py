@@ -1,12 +1,25 @@
+import io
+import random
 import unittest
 from markdown_blocks import (
     markdown_to_html_node,
     markdown_to_blocks,
     block_to_block_type,
+    iter_block_lines,
+    iter_markdown_blocks,
+    iter_markdown_html,
+    BlockCache,
     BlockType,
 )
 
 
+def render_or_error(render):
+    try:
+        return render()
+    except ValueError as e:
+        return str(e)
+
+
 class TestMarkdownToHTML(unittest.TestCase):
     def test_markdown_to_blocks(self):
         md = """
@@ -163,6 +176,80 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
 
+    def test_iter_markdown_blocks_matches_split(self):
+        rng = random.Random(7)
+        pieces = ["a", "b c", "\n", "\n\n", " ", "# h", "- i"]
+        for _ in range(3000):
+            md = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 10)))
+            self.assertEqual(
+                list(iter_markdown_blocks(io.StringIO(md))), markdown_to_blocks(md), md
+            )
+
+    def test_iter_block_lines_classifies_like_blocks(self):
+        rng = random.Random(11)
+        pieces = ["a", "\n", "\n\n", " ", "\t", "# h", "- ", "- i", "1. ", "1. i", "2. j", "> q", "```", "```\n"]
+        for _ in range(3000):
+            md = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            streamed = list(iter_block_lines(io.StringIO(md)))
+            self.assertEqual(["\n".join(lines) for _, lines in streamed], markdown_to_blocks(md), md)
+            self.assertEqual(
+                [block_type for block_type, _ in streamed],
+                [block_to_block_type(block) for block in markdown_to_blocks(md)],
+                md,
+            )
+            self.assertEqual(
+                render_or_error(lambda: "".join(iter_markdown_html(io.StringIO(md)))),
+                render_or_error(lambda: markdown_to_html_node(md).to_html()),
+                md,
+            )
+
+    def test_iter_markdown_html(self):
+        md = """
+# heading
+
+This is **bolded** paragraph
+text in a p
+
+> This is a
+> blockquote block
+
+
+- This is a list
+- with _items_
+
+```
+code here
+```
+"""
+        html = "".join(iter_markdown_html(io.StringIO(md)))
+        self.assertEqual(html, markdown_to_html_node(md).to_html())
+
+    def test_block_cache_matches_uncached(self):
+        md = "# Title\n\nShared **footer**\n\n> quote\n\nShared **footer**"
+        cache = BlockCache()
+        for _ in range(2):
+            html = "".join(iter_markdown_html(io.StringIO(md), cache))
+            self.assertEqual(html, markdown_to_html_node(md).to_html())
+        self.assertEqual((cache.hits, cache.misses), (5, 3))
+
+    def test_block_cache_evicts_least_recently_used(self):
+        cache = BlockCache(max_blocks=2)
+        cache.render("a")
+        cache.render("b")
+        cache.render("a")
+        cache.render("c")
+        self.assertEqual(len(cache.blocks), 2)
+        cache.render("a")
+        cache.render("b")
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_block_cache_does_not_store_errors(self):
+        cache = BlockCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.render("**unclosed")
+        self.assertEqual((cache.misses, len(cache.blocks)), (2, 0))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
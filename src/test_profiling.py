@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+
+from gencontent import BuildContext, generate_pages_recursive
+from profiling import BuildProfile, StageTimer
+from testutil import quiet
+
+
+class TestBuildProfile(unittest.TestCase):
+    def test_phases_accumulate(self):
+        profile = BuildProfile()
+        with profile.phase("copy"):
+            pass
+        with profile.phase("copy"):
+            pass
+        report = profile.report()
+        self.assertEqual(list(report["phases"]), ["copy"])
+        self.assertGreaterEqual(report["phases"]["copy"], 0)
+
+    def test_slowest_pages(self):
+        profile = BuildProfile()
+        profile.record_page("a.md", {"read": 1.0, "write": 1.0})
+        profile.record_page("b.md", {"read": 3.0, "write": 0.5})
+        profile.record_page("c.md", {"read": 0.1, "write": 0.1})
+        report = profile.report(top=2)
+        self.assertEqual(
+            [page["path"] for page in report["slowest_pages"]], ["b.md", "a.md"]
+        )
+        self.assertEqual(report["pages"]["count"], 3)
+        self.assertAlmostEqual(report["pages"]["stages"]["read"], 4.1)
+
+    def test_stage_timer(self):
+        timer = StageTimer()
+        timer.lap("read")
+        timer.lap("write")
+        self.assertEqual(list(timer.stages), ["read", "write"])
+
+    def test_profiled_generation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            with open(os.path.join(content, "index.md"), "w") as f:
+                f.write("# Home\n\nSome **text**")
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as f:
+                f.write("{{ Title }}{{ Content }}")
+            profile = BuildProfile()
+            with quiet():
+                generate_pages_recursive(content, os.path.join(tmp, "docs"), BuildContext(template, profile=profile))
+            report_path = os.path.join(tmp, "profile.json")
+            profile.save(report_path)
+            with open(report_path) as f:
+                report = json.load(f)
+            with open(os.path.join(tmp, "docs", "index.html")) as f:
+                self.assertEqual(f.read(), "Home<div><h1>Home</h1><p>Some <b>text</b></p></div>")
+        self.assertEqual(
+            list(report["slowest_pages"][0]["stages"]),
+            ["read", "parse", "inline", "serialize", "template", "write"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
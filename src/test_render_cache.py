@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import render_cache
+from gencontent import BuildContext, generate_pages_recursive, render_page
+from render_cache import RenderCache
+from testutil import quiet, read, write
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache.open(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_get_and_put(self):
+        key = self.cache.key("# Home", "/")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Home", "<div><h1>Home</h1></div>")
+        self.assertEqual(self.cache.get(key), ("Home", "<div><h1>Home</h1></div>"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_source_and_basepath(self):
+        key = self.cache.key("# Home", "/")
+        self.assertNotEqual(key, self.cache.key("# Home!", "/"))
+        self.assertNotEqual(key, self.cache.key("# Home", "/Static/"))
+        with mock.patch.object(render_cache, "RENDERER_VERSION", render_cache.RENDERER_VERSION + 1):
+            self.assertNotEqual(key, self.cache.key("# Home", "/"))
+
+    def test_evicts_least_recently_used(self):
+        for name in ["a", "b", "c"]:
+            self.cache.put(name, name, "x" * 99)
+        self.cache.get("a")
+        self.cache.max_bytes = 200
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_persists_across_connections(self):
+        self.cache.put("a", "A", "<p>a</p>")
+        self.cache.close()
+        self.cache = RenderCache.open(os.path.join(self.tmp.name, "cache"))
+        self.assertEqual(self.cache.get("a"), ("A", "<p>a</p>"))
+
+
+class TestCachedRender(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        write(self.template, '<title>{{ Title }}</title><a href="/">{{ Content }}</a>')
+        write(os.path.join(self.content, "index.md"), "# Home\n\nSome **bold** text")
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n- a\n- b")
+        self.cache = RenderCache.open(os.path.join(root, "cache"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_matches_uncached(self):
+        plain = os.path.join(self.tmp.name, "plain")
+        cached = os.path.join(self.tmp.name, "cached")
+        generate_pages_recursive(self.content, plain, BuildContext(self.template, "/Static/"))
+        for _ in range(2):
+            generate_pages_recursive(self.content, cached, BuildContext(self.template, "/Static/", render_cache=self.cache))
+            for page in ["index.html", os.path.join("blog", "index.html")]:
+                self.assertEqual(read(os.path.join(cached, page)), read(os.path.join(plain, page)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_missing_title_not_cached(self):
+        source = os.path.join(self.content, "index.md")
+        write(source, "no title")
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                render_page(source, os.path.join(self.tmp.name, "out.html"), BuildContext(self.template, render_cache=self.cache))
+        self.assertEqual(self.cache.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from gencontent import BuildContext, generate_pages_parallel, generate_pages_recursive
+from manifest import Manifest
+from sitemap import SITEMAP_NAMESPACE, URLSET_FOOTER, URLSET_HEADER, Sitemap, page_url, shard_entries, url_element
+from testutil import quiet, write
+
+
+NS = {"s": SITEMAP_NAMESPACE}
+
+
+def locs(path, tag="url"):
+    return [loc.text for loc in ET.parse(path).getroot().findall(f"s:{tag}/s:loc", NS)]
+
+
+class TestSitemap(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(quiet())
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home")
+        write(os.path.join(self.content, "blog", "tom & jerry", "index.md"), "# Tom")
+        write(os.path.join(self.content, "about.md"), "# About")
+        os.utime(os.path.join(self.content, "about.md"), (0, 86400))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_page_url(self):
+        self.assertEqual(page_url("index.html"), "")
+        self.assertEqual(page_url("blog/index.html"), "blog/")
+        self.assertEqual(page_url("about.html"), "about.html")
+
+    def test_single_file(self):
+        sitemap = Sitemap(self.public, "https://example.com/", "/Static/")
+        manifest = Manifest(self.public)
+        generate_pages_recursive(self.content, self.public, BuildContext(self.template, "/Static/", manifest, sitemap=sitemap))
+        self.assertEqual(sitemap.write(manifest), [os.path.join(self.public, "sitemap.xml")])
+        self.assertEqual(
+            locs(os.path.join(self.public, "sitemap.xml")),
+            [
+                "https://example.com/Static/",
+                "https://example.com/Static/about.html",
+                "https://example.com/Static/blog/tom%20%26%20jerry/",
+            ],
+        )
+        with open(os.path.join(self.public, "sitemap.xml")) as f:
+            self.assertIn("<lastmod>1970-01-02T00:00:00Z</lastmod>", f.read())
+        self.assertIn("sitemap.xml", manifest.seen)
+
+    def test_parallel_matches_serial(self):
+        serial = Sitemap(self.public, "https://example.com")
+        generate_pages_recursive(self.content, self.public, BuildContext(self.template, sitemap=serial))
+        parallel = Sitemap(self.public, "https://example.com")
+        errors = generate_pages_parallel(self.content, self.public, BuildContext(self.template, sitemap=parallel), jobs=2)
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(serial.entries), sorted(parallel.entries))
+
+    def test_shards_with_index(self):
+        sitemap = Sitemap(self.public, "https://example.com")
+        generate_pages_recursive(self.content, self.public, BuildContext(self.template, sitemap=sitemap))
+        written = sitemap.write(max_urls=2)
+        self.assertEqual([os.path.basename(path) for path in written], ["sitemap-1.xml", "sitemap-2.xml", "sitemap.xml"])
+        self.assertEqual(
+            locs(written[-1], "sitemap"),
+            ["https://example.com/sitemap-1.xml", "https://example.com/sitemap-2.xml"],
+        )
+        self.assertEqual(len(locs(written[0])) + len(locs(written[1])), 3)
+
+    def test_shard_byte_limit(self):
+        entries = [(f"https://example.com/{i}.html", 0) for i in range(10)]
+        size = len(url_element(*entries[0]))
+        self.assertEqual(shard_entries(entries, max_bytes=len(URLSET_HEADER) + len(URLSET_FOOTER) + 3 * size), [(0, 3), (3, 6), (6, 9), (9, 10)])
+        self.assertEqual(shard_entries([]), [(0, 0)])
+
+    def test_empty(self):
+        os.makedirs(self.public)
+        path = os.path.join(self.public, "sitemap.xml")
+        self.assertEqual(Sitemap(self.public, "https://example.com").write(), [path])
+        self.assertEqual(locs(path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import gzip
+import http.client
+import os
+import tempfile
+import threading
+import unittest
+
+from staticserver import accepts_gzip, guess_type, make_server, parse_range
+from testutil import write
+
+
+class TestParsing(unittest.TestCase):
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-3", 10), (0, 3))
+        self.assertEqual(parse_range("bytes=4-", 10), (4, 9))
+        self.assertEqual(parse_range("bytes=-3", 10), (7, 9))
+        self.assertEqual(parse_range("bytes=5-100", 10), (5, 9))
+        self.assertEqual(parse_range("bytes=10-", 10), "invalid")
+        self.assertEqual(parse_range("bytes=5-2", 10), "invalid")
+        self.assertIsNone(parse_range("bytes=0-1,4-5", 10))
+        self.assertIsNone(parse_range("lines=0-1", 10))
+        self.assertIsNone(parse_range("bytes=a-b", 10))
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, gzip;q=0.8"))
+        self.assertFalse(accepts_gzip("gzip;q=0"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertFalse(accepts_gzip(""))
+
+    def test_guess_type(self):
+        self.assertEqual(guess_type("index.html"), "text/html; charset=utf-8")
+        self.assertEqual(guess_type("index.html.gz"), "application/gzip")
+        self.assertEqual(guess_type("README"), "application/octet-stream")
+
+
+class TestStaticServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.page = b"<h1>Home</h1>" * 20
+        write(os.path.join(root, "index.html"), self.page, 1_000_000_000)
+        write(os.path.join(root, "index.html.gz"), gzip.compress(self.page), 2_000_000_000)
+        write(os.path.join(root, "images", "tom.png"), b"0123456789")
+        write(os.path.join(root, "index.0123456789.css"), b"body {}")
+        write(os.path.join(root, ".manifest.json"), b"{}")
+        self.server = make_server(root, port=0, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def request(self, path, method="GET", **headers):
+        self.connection.request(method, path, headers=headers)
+        response = self.connection.getresponse()
+        return response, response.read()
+
+    def test_serves_index_with_validators(self):
+        response, body = self.request("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, self.page)
+        self.assertEqual(response.getheader("Content-Type"), "text/html; charset=utf-8")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertIsNotNone(response.getheader("ETag"))
+        self.assertIsNotNone(response.getheader("Last-Modified"))
+
+    def test_not_modified(self):
+        response, _ = self.request("/index.html")
+        etag = response.getheader("ETag")
+        response, body = self.request("/index.html", **{"If-None-Match": etag})
+        self.assertEqual((response.status, body), (304, b""))
+        response, _ = self.request("/index.html", **{"If-None-Match": '"other"'})
+        self.assertEqual(response.status, 200)
+        last_modified = response.getheader("Last-Modified")
+        response, _ = self.request("/index.html", **{"If-Modified-Since": last_modified})
+        self.assertEqual(response.status, 304)
+
+    def test_gzip_sibling(self):
+        response, body = self.request("/index.html", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.decompress(body), self.page)
+        self.assertTrue(response.getheader("ETag").endswith('-gz"'))
+
+    def test_gzip_file_requested_directly(self):
+        response, body = self.request("/index.html.gz", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Type"), "application/gzip")
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(gzip.decompress(body), self.page)
+
+    def test_stale_gzip_sibling_ignored(self):
+        os.utime(os.path.join(self.tmp.name, "index.html.gz"), ns=(1, 1))
+        response, body = self.request("/index.html", **{"Accept-Encoding": "gzip"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(body, self.page)
+
+    def test_range(self):
+        response, body = self.request("/images/tom.png", Range="bytes=2-5")
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body, b"2345")
+        self.assertEqual(response.getheader("Content-Range"), "bytes 2-5/10")
+        response, body = self.request("/images/tom.png", Range="bytes=-3")
+        self.assertEqual(body, b"789")
+
+    def test_range_not_satisfiable(self):
+        response, _ = self.request("/images/tom.png", Range="bytes=20-")
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.getheader("Content-Range"), "bytes */10")
+
+    def test_if_range_mismatch_sends_whole_file(self):
+        response, body = self.request("/images/tom.png", Range="bytes=2-5", **{"If-Range": '"stale"'})
+        self.assertEqual((response.status, body), (200, b"0123456789"))
+
+    def test_head(self):
+        response, body = self.request("/images/tom.png", method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Length"), "10")
+        self.assertEqual(body, b"")
+
+    def test_fingerprinted_assets_are_immutable(self):
+        response, _ = self.request("/index.0123456789.css")
+        self.assertEqual(response.getheader("Cache-Control"), "public, max-age=31536000, immutable")
+        response, _ = self.request("/images/tom.png")
+        self.assertIn("must-revalidate", response.getheader("Cache-Control"))
+
+    def test_directory_redirect(self):
+        response, _ = self.request("/images")
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.getheader("Location"), "/images/")
+
+    def test_not_found(self):
+        for path in ("/missing.html", "/.manifest.json", "/../etc/passwd", "/images/", "/%00", "/images/%00.png"):
+            self.connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+            response, _ = self.request(path)
+            self.assertEqual(response.status, 404, path)
+            self.connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
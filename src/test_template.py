@@ -0,0 +1,100 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import Slot, compile_template, load_template
+
+
+TEMPLATE = '<title> {{ Title }} </title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+def render_with_replace(template, title, content, basepath):
+    template = template.replace("{{ Title }}", title)
+    template = template.replace("{{ Content }}", content)
+    template = template.replace('href="/', f'href="{basepath}')
+    return template.replace('src="/', f'src="{basepath}')
+
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = compile_template(TEMPLATE, "/Static/")
+        self.assertEqual(
+            template.segments,
+            [
+                "<title> ",
+                Slot("Title"),
+                ' </title><link href="/Static/index.css"><article>',
+                Slot("Content"),
+                "</article>",
+            ],
+        )
+
+    def test_render_matches_replace(self):
+        content = '<p><a href="/blog">blog</a><img src="/images/a.png" alt=""></p>'
+        for basepath in ["/", "/Static/"]:
+            template = compile_template(TEMPLATE, basepath)
+            self.assertEqual(
+                template.render(Title="Hello", Content=content),
+                render_with_replace(TEMPLATE, "Hello", content, basepath),
+            )
+
+    def test_write_streams_chunks(self):
+        template = compile_template(TEMPLATE, "/Static/")
+        chunks = ["<p>", '<a href="/blog">', "blog", "</a>", "</p>"]
+        fp = io.StringIO()
+        template.write(fp, Title="Hello", Content=iter(chunks))
+        self.assertEqual(
+            fp.getvalue(),
+            template.render(Title="Hello", Content="".join(chunks)),
+        )
+
+    def test_asset_urls_rewritten(self):
+        asset_urls = {"/index.css": "/index.0123456789.css", "/images/a.png": "/images/a.abcdef0123.png"}
+        content = '<p><a href="/blog">blog</a><img src="/images/a.png" alt=""></p>'
+        template = compile_template(TEMPLATE, "/Static/", asset_urls)
+        self.assertEqual(
+            template.render(Title="Hello", Content=content),
+            '<title> Hello </title><link href="/Static/index.0123456789.css"><article>'
+            '<p><a href="/Static/blog">blog</a><img src="/Static/images/a.abcdef0123.png" alt=""></p>'
+            "</article>",
+        )
+
+    def test_render_collects_asset_refs(self):
+        refs = set()
+        template = compile_template(TEMPLATE, "/", {})
+        template.render(refs, Title="Hello", Content='<a href="/blog">blog</a><img src="/images/a.png">')
+        self.assertEqual(refs, {"/index.css", "/images/a.png"})
+
+    def test_no_placeholders(self):
+        template = compile_template('<a href="/">home</a>', "/x/")
+        self.assertEqual(template.render(), '<a href="/x/">home</a>')
+
+    def test_load_template_cached_until_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as f:
+                f.write("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, "w") as f:
+                f.write("<h1>{{ Title }}</h1>")
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(load_template(path).render(Title="x"), "<h1>x</h1>")
+            self.assertIsNot(load_template(path, asset_urls={"/a.css": "/a.0123456789.css"}), first)
+
+    def test_load_template_recompiled_when_referenced_asset_renamed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as f:
+                f.write('<link href="/a.css">{{ Content }}')
+            asset_urls = {"/a.css": "/a.0123456789.css", "/b.png": "/b.0123456789.png"}
+            first = load_template(path, asset_urls=asset_urls)
+            asset_urls["/b.png"] = "/b.abcdef0123.png"
+            self.assertIs(load_template(path, asset_urls=asset_urls), first)
+            asset_urls["/a.css"] = "/a.abcdef0123.css"
+            self.assertEqual(load_template(path, asset_urls=asset_urls).render(Content=""), '<link href="/a.abcdef0123.css">')
+
+
+if __name__ == "__main__":
+    unittest.main()
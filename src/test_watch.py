@@ -0,0 +1,151 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from copystatic import copy_files_recursive, find_static_files, output_dirs
+from fingerprint import load_asset_urls, save_asset_urls
+from gencontent import BuildContext, generate_pages_recursive
+from manifest import Manifest
+from testutil import quiet, read, write
+from watch import SiteWatcher, scan_static
+
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.public = os.path.join(root, "docs")
+        self.template = os.path.join(root, "static", "template.html")
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}", 1)
+        write(os.path.join(self.static, "index.css"), "body {}", 1)
+        write(os.path.join(self.content, "index.md"), "# Home", 1)
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog", 1)
+        with quiet():
+            manifest = Manifest.load(self.public)
+            copy_files_recursive(self.static, self.public, manifest)
+            generate_pages_recursive(self.content, self.public, BuildContext(self.template, "/", manifest))
+            manifest.save()
+        self.watcher = SiteWatcher(self.content, self.template, self.static, self.public)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def poll(self):
+        with quiet():
+            return self.watcher.poll()
+
+    def test_no_changes(self):
+        self.assertEqual(self.poll(), {})
+
+    def test_changed_page_only(self):
+        blog = os.path.join(self.content, "blog", "index.md")
+        write(blog, "# Blog\n\nNew post", 2)
+        result = self.poll()
+        self.assertEqual(result["pages"], [blog])
+        self.assertEqual(result["assets"], [])
+        self.assertIn("New post", read(os.path.join(self.public, "blog", "index.html")))
+        self.assertEqual(self.poll(), {})
+
+    def test_template_change_renders_all(self):
+        write(self.template, "<h2>{{ Title }}</h2>{{ Content }}", 2)
+        result = self.poll()
+        self.assertEqual(len(result["pages"]), 2)
+        self.assertTrue(read(os.path.join(self.public, "index.html")).startswith("<h2>Home"))
+
+    def test_removed_page(self):
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        result = self.poll()
+        self.assertEqual(len(result["removed_pages"]), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        manifest = Manifest.load(self.public)
+        self.assertNotIn("blog/index.html", manifest.entries)
+        self.assertIn("index.html", manifest.entries)
+
+    def test_gzip_siblings_follow_pages(self):
+        self.watcher.gzip = True
+        blog = os.path.join(self.content, "blog", "index.md")
+        write(blog, "# Blog\n\n" + "New post " * 20, 2)
+        self.poll()
+        gz_path = os.path.join(self.public, "blog", "index.html.gz")
+        with open(gz_path, "rb") as f:
+            self.assertIn(b"New post", gzip.decompress(f.read()))
+        os.remove(blog)
+        self.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertNotIn("blog/index.html.gz", Manifest.load(self.public).entries)
+
+    def test_fingerprinted_asset_change_rerenders_pages(self):
+        write(self.template, '<link href="/index.css">{{ Content }}', 1)
+        with quiet():
+            manifest = Manifest.load(self.public)
+            asset_urls = {}
+            copy_files_recursive(self.static, self.public, manifest, asset_urls=asset_urls)
+            save_asset_urls(self.public, asset_urls)
+            generate_pages_recursive(self.content, self.public, BuildContext(self.template, "/", manifest, asset_urls=asset_urls))
+            manifest.prune()
+            manifest.save()
+        watcher = SiteWatcher(self.content, self.template, self.static, self.public, fingerprint=True)
+        old_url = asset_urls["/index.css"]
+        self.assertIn(old_url, read(os.path.join(self.public, "index.html")))
+
+        write(os.path.join(self.static, "index.css"), "body { color: red }", 2)
+        with quiet():
+            result = watcher.poll()
+        self.assertEqual(len(result["pages"]), 2)
+        new_url = load_asset_urls(self.public)["/index.css"]
+        self.assertNotEqual(new_url, old_url)
+        self.assertFalse(os.path.exists(self.public + old_url))
+        self.assertEqual(read(self.public + new_url), "body { color: red }")
+        self.assertIn(new_url, read(os.path.join(self.public, "blog", "index.html")))
+        self.assertNotIn(old_url[1:], Manifest.load(self.public).entries)
+
+    def test_fingerprinted_asset_change_rerenders_only_referencing_pages(self):
+        write(os.path.join(self.static, "images", "ring.png"), "png", 1)
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n![ring](/images/ring.png)", 1)
+        with quiet():
+            manifest = Manifest.load(self.public)
+            asset_urls = {}
+            copy_files_recursive(self.static, self.public, manifest, asset_urls=asset_urls)
+            save_asset_urls(self.public, asset_urls)
+            generate_pages_recursive(self.content, self.public, BuildContext(self.template, "/", manifest, asset_urls=asset_urls))
+            manifest.prune()
+            manifest.save()
+        watcher = SiteWatcher(self.content, self.template, self.static, self.public, fingerprint=True)
+
+        write(os.path.join(self.static, "images", "ring.png"), "new png", 2)
+        with quiet():
+            result = watcher.poll()
+        self.assertEqual(result["pages"], [os.path.join(self.content, "blog", "index.md")])
+        new_url = load_asset_urls(self.public)["/images/ring.png"]
+        self.assertIn(new_url, read(os.path.join(self.public, "blog", "index.html")))
+
+    def test_scan_static_uses_directory_entries(self):
+        write(os.path.join(self.static, "images", "a.png"), "png", 1)
+        _, files = find_static_files(self.static, self.public, output_dirs(self.public))
+        with mock.patch("os.stat", side_effect=AssertionError("stat called")):
+            state, dests = scan_static(self.static, self.public, output_dirs(self.public), {}, {})
+        self.assertEqual(dests, dict(files))
+        self.assertEqual(sorted(state), sorted(dests))
+
+    def test_changed_and_new_assets(self):
+        write(os.path.join(self.static, "index.css"), "body { color: red }", 2)
+        write(os.path.join(self.static, "images", "a.png"), "png", 2)
+        result = self.poll()
+        self.assertEqual(result["pages"], [])
+        self.assertEqual(len(result["assets"]), 2)
+        self.assertEqual(read(os.path.join(self.public, "images", "a.png")), "png")
+        self.assertEqual(read(os.path.join(self.public, "index.css")), "body { color: red }")
+
+    def test_broken_page_keeps_watching(self):
+        write(os.path.join(self.content, "index.md"), "# Home\n\n**unclosed", 2)
+        result = self.poll()
+        self.assertEqual(result["pages"], [])
+        self.assertIn("Home", read(os.path.join(self.public, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import contextlib
+import io
+import os
+
+
+def write(path, data, mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
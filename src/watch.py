@@ -0,0 +1,192 @@
+import os
+import time
+from pathlib import Path
+
+from compress import GZIP_SUFFIX, compress_outputs
+from copystatic import EXCLUDE_LIST, output_dirs, publish_static_file
+from fingerprint import asset_url, can_fingerprint, fingerprint_name, load_asset_urls, save_asset_urls
+from gencontent import BuildContext, generate_page
+from manifest import Manifest, remove_empty_dirs
+
+
+def scan_markdown(dir_path, state):
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                scan_markdown(entry.path, state)
+            elif entry.is_file() and entry.name.endswith(".md"):
+                stat = entry.stat()
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def scan_static(source_dir_path, dest_dir_path, excluded_dirs, state, dests):
+    with os.scandir(source_dir_path) as entries:
+        for entry in entries:
+            if entry.name in EXCLUDE_LIST:
+                continue
+            dest_path = os.path.join(dest_dir_path, entry.name)
+            if entry.is_file():
+                stat = entry.stat()
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                dests[entry.path] = dest_path
+            elif entry.is_dir() and os.path.realpath(entry.path) not in excluded_dirs:
+                scan_static(entry.path, dest_path, excluded_dirs, state, dests)
+    return state, dests
+
+
+def stat_files(paths, state):
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def diff_snapshots(old, new):
+    changed = {path for path, stat in new.items() if old.get(path) != stat}
+    removed = {path for path in old if path not in new}
+    return changed, removed
+
+
+class SiteWatcher:
+    def __init__(
+        self, dir_path_content, template_path, dir_path_static, dir_path_public, basepath="/", mode="copy",
+        gzip=False, fingerprint=False, block_cache=None, render_cache=None, ast_cache=None,
+    ):
+        self.dir_path_content = dir_path_content
+        self.template_path = template_path
+        self.dir_path_static = dir_path_static
+        self.dir_path_public = dir_path_public
+        self.basepath = basepath
+        self.mode = mode
+        self.gzip = gzip
+        self.asset_urls = load_asset_urls(dir_path_public) if fingerprint else None
+        self.manifest = Manifest.load(dir_path_public)
+        self.manifest.resume()
+        self.context = BuildContext(
+            template_path, basepath, self.manifest, asset_urls=self.asset_urls, block_cache=block_cache,
+            render_cache=render_cache, ast_cache=ast_cache,
+        )
+        self.pages, self.template, self.assets, self.asset_dests = self.scan()
+
+    def scan(self):
+        pages = scan_markdown(self.dir_path_content, {})
+        template = stat_files([self.template_path], {})
+        assets, asset_dests = scan_static(
+            self.dir_path_static, self.dir_path_public, output_dirs(self.dir_path_public), {}, {}
+        )
+        return pages, template, assets, asset_dests
+
+    def invalidate(self):
+        self.pages, self.template, self.assets = {}, {}, {}
+
+    def page_dest(self, from_path):
+        rel_path = os.path.relpath(from_path, self.dir_path_content)
+        return Path(self.dir_path_public, rel_path).with_suffix(".html")
+
+    def poll(self):
+        pages, template, assets, asset_dests = self.scan()
+        changed_pages, removed_pages = diff_snapshots(self.pages, pages)
+        template_changed = template != self.template
+        changed_assets, removed_assets = diff_snapshots(self.assets, assets)
+        removed_dests = [self.asset_dests[path] for path in removed_assets]
+        self.pages, self.template, self.assets = pages, template, assets
+        self.asset_dests = asset_dests
+
+        if not (template_changed or changed_pages or removed_pages or changed_assets or removed_assets):
+            return {}
+
+        self.manifest.file_hashes.clear()
+        changed_urls = set()
+        for from_path in sorted(changed_assets):
+            dest_path = asset_dests[from_path]
+            if self.asset_urls is not None and can_fingerprint(dest_path):
+                hashed_path = fingerprint_name(dest_path, self.manifest.hash_file(from_path))
+                if self.rename_asset(dest_path, hashed_path):
+                    changed_urls.add(asset_url(dest_path, self.dir_path_public))
+                dest_path = hashed_path
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            method, digest, _ = publish_static_file(from_path, dest_path, self.manifest, self.mode)
+            if method is not None:
+                print(f" * {from_path} -> {dest_path}")
+            self.manifest.record(dest_path, digest)
+        for dest_path in sorted(removed_dests):
+            if self.asset_urls is not None and can_fingerprint(dest_path):
+                if self.rename_asset(dest_path, None):
+                    changed_urls.add(asset_url(dest_path, self.dir_path_public))
+            else:
+                self.remove(dest_path)
+
+        if template_changed:
+            print("Template changed, regenerating all pages...")
+            changed_pages = set(pages)
+        elif changed_urls:
+            stale = set(self.manifest.pages_referencing(changed_urls))
+            referencing = {path for path in pages if self.manifest.key(self.page_dest(path)) in stale}
+            print(f"Asset names changed, regenerating {len(referencing)} page(s) that reference them...")
+            changed_pages |= referencing
+        rendered = []
+        for from_path in sorted(changed_pages):
+            if self.render(from_path):
+                rendered.append(from_path)
+        for from_path in sorted(removed_pages):
+            self.remove(self.page_dest(from_path))
+
+        if self.gzip:
+            compress_outputs(self.manifest)
+        if self.asset_urls is not None:
+            save_asset_urls(self.dir_path_public, self.asset_urls)
+        self.manifest.save()
+        return {
+            "pages": rendered,
+            "removed_pages": sorted(removed_pages),
+            "assets": sorted(changed_assets),
+            "removed_assets": sorted(removed_assets),
+        }
+
+    def render(self, from_path):
+        dest_path = self.page_dest(from_path)
+        try:
+            refs = generate_page(from_path, dest_path, self.context)
+        except Exception as e:
+            print(f" ! {from_path}: {type(e).__name__}: {e}")
+            return False
+        self.context.record_page(from_path, dest_path, refs)
+        return True
+
+    def rename_asset(self, dest_path, hashed_path):
+        url = asset_url(dest_path, self.dir_path_public)
+        old_url = self.asset_urls.get(url)
+        new_url = asset_url(hashed_path, self.dir_path_public) if hashed_path is not None else None
+        if old_url == new_url:
+            return False
+        if old_url is not None:
+            self.remove(os.path.join(self.dir_path_public, *old_url[1:].split("/")))
+        if new_url is None:
+            del self.asset_urls[url]
+        else:
+            self.asset_urls[url] = new_url
+        return True
+
+    def remove(self, dest_path):
+        removed = False
+        for path in (dest_path, f"{dest_path}{GZIP_SUFFIX}"):
+            if os.path.exists(path):
+                print(f" - {path}")
+                os.remove(path)
+                removed = True
+            self.manifest.forget(path)
+        if removed:
+            remove_empty_dirs(os.path.dirname(dest_path), self.dir_path_public)
+
+    def run(self, interval=0.5):
+        print(f"Watching for changes every {interval}s, press Ctrl+C to stop...")
+        try:
+            while True:
+                time.sleep(interval)
+                self.poll()
+        except KeyboardInterrupt:
+            print("Stopped watching")